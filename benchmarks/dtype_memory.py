@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from csv_ingest import load_and_concat_csvs
+from schemas import LINKEDIN_PROCESSED_SCHEMA, TELEGRAM_PROCESSED_SCHEMA, EMAILS_DATABASE_SCHEMA
+
+# ----------------- Declared dtypes memory report -------------------- #
+#
+# Loads the processed LinkedIn/Telegram data and the emails database the way the dashboard
+# did before the schemas (inferred object columns) and with their declared schemas, and
+# reports the in-memory size of both. Without directories, synthetic data shaped like the
+# processor output is written first. Run from the repository root:
+#
+#   python -m benchmarks.dtype_memory --rows 500000 --output dtype_memory.json
+#   python -m benchmarks.dtype_memory --linkedin Processed_Data/linkedin_processed_data \
+#       --telegram Processed_Data/telegram_processed_data --emails Processed_Data/emails_database
+
+WORDS = ("hiring", "developer", "remote", "salary", "apply", "team", "experience", "python", "data", "urgent",
+         "مطلوب", "وظيفة", "شركة", "الرياض", "جدة", "راتب", "خبرة", "مهندس", "محاسب", "مبيعات")
+
+
+def _texts(rng, rows):
+    return [" ".join(rng.choices(WORDS, k=rng.randint(20, 60))) + f" #{i}" for i in range(rows)]
+
+
+def _pool(rng, prefix, size):
+    return [f"{prefix} {' '.join(rng.choices(WORDS, k=3))} {i}" for i in range(size)]
+
+
+def _times(rng, rows):
+    start = pd.Timestamp("2024-11-01").value
+    return pd.to_datetime(np.array([start + rng.randrange(60 * 86400) * 10 ** 9 for _ in range(rows)]))
+
+
+def _write(df, directory, files):
+    """Splits `df` into `files` CSVs named like the processor's source files"""
+    os.makedirs(directory, exist_ok=True)
+    for i in range(files):
+        part = df.iloc[i * len(df) // files:(i + 1) * len(df) // files]
+        part.to_csv(os.path.join(directory, f"part_{i}.csv"), index=False, encoding="utf-8")
+
+
+def make_linkedin(rng, rows, files):
+    authors = _pool(rng, "author", max(1, rows // 20))
+    headlines = _pool(rng, "headline", max(1, rows // 40))
+    scrapes = [f"2024-11-{day:02d} 14:40:19" for day in range(1, 29)]
+    emails = [f"['hr{i}@company{i % 97}.com']" if i % 3 == 0 else "[]" for i in range(rows)]
+    return pd.DataFrame({
+        "authorFollowersCount": rng.choices([f"{n}K" for n in range(1, 999)] + ["-"], k=rows),
+        "authorHeadline": rng.choices(headlines, k=rows),
+        "authorName": rng.choices(authors, k=rows),
+        "authorProfileUrl": [f"https://www.linkedin.com/in/{name.split()[-1]}" for name in rng.choices(authors, k=rows)],
+        "authorType": rng.choices(["Person", "Company"], k=rows),
+        "isRepost": False,
+        "postedAtISO": [f"2024-11-01T12:{i % 60:02d}:06.066Z" for i in range(rows)],
+        "scrappingDate": rng.choices(scrapes, k=rows),
+        "text": _texts(rng, rows),
+        "timeSincePosted": rng.choices([f"{n}m" for n in range(1, 60)] + [f"{n}h" for n in range(1, 24)], k=rows),
+        "url": [f"https://www.linkedin.com/feed/update/urn:li:activity:{7258092186385207296 + i}" for i in range(rows)],
+        "source_file": [f"run{i * files // rows}_results" for i in range(rows)],
+        "emails": emails,
+        "email_count": [1 if e != "[]" else 0 for e in emails],
+        "links": "[]",
+        "link_count": 0,
+        "postTime": _times(rng, rows),
+        "postStatus": "Empty",
+    })
+
+
+def make_telegram(rng, rows, files):
+    channels = [f"channel_{i}" for i in range(max(1, files // 2))]
+    channel = rng.choices(channels, k=rows)
+    return pd.DataFrame({
+        "authorName": [f"{name} | JOBS" for name in channel],
+        "authorTelegram": [f"https://t.me/{name}" for name in channel],
+        "channelName": channel,
+        "date": [f"2024-10-31T15:{i % 60:02d}:58+00:00" for i in range(rows)],
+        "scrappingDate": rng.choices(["2024-11-06 00:54:00", "2024-11-01 14:47:25"], k=rows),
+        "text": _texts(rng, rows),
+        "viewsCount": rng.choices([f"{n / 10:.1f}K" for n in range(10, 100)], k=rows),
+        "source_file": [f"{name}_results" for name in channel],
+        "emails": "[]",
+        "email_count": 0,
+        "links": [f"['https://t.me/{name}/{i}']" for i, name in enumerate(channel)],
+        "link_count": 1,
+        "postTime": _times(rng, rows),
+        "postStatus": "Empty",
+    })
+
+
+def make_emails(rng, rows):
+    return pd.DataFrame({
+        "company_name": _pool(rng, "company", rows),
+        "job_title": rng.choices(_pool(rng, "title", max(1, rows // 10)), k=rows),
+        "city": rng.choices([f"مدينة {i}" for i in range(60)], k=rows),
+        "region": rng.choices([f"منطقة {i}" for i in range(13)], k=rows),
+        "sectors": [str(rng.sample(WORDS, 2)) for _ in range(rows)],
+        "specialization": rng.choices([f"تخصص {i}" for i in range(32)], k=rows),
+        "experience": rng.choices(["غير محدد", "1-3", "3-5", "5+"], k=rows),
+        "education": rng.choices(["غير محدد", "بكالوريوس", "ماجستير", "دبلوم"], k=rows),
+        "email": [f"hr{i}@company{i % 997}.com" for i in range(rows)],
+        "domain": rng.choices([f"company{i}.com" for i in range(997)], k=rows),
+        "date": pd.Timestamp("2024-11-06"),
+    })
+
+
+def measure(directory, schema, parse_dates):
+    start = time.perf_counter()
+    df = load_and_concat_csvs(directory, schema=schema, parse_dates=parse_dates)
+    seconds = time.perf_counter() - start
+    return df, df.memory_usage(deep=True, index=False), seconds
+
+
+def report(name, directory, schema, parse_dates):
+    before_df, before, before_s = measure(directory, None, parse_dates)
+    after_df, after, after_s = measure(directory, schema, parse_dates)
+    before_total, after_total = int(before.sum()), int(after.sum())
+    columns = sorted(after.index, key=lambda column: before.get(column, 0) - after[column], reverse=True)
+    return {
+        "rows": len(after_df),
+        "before_mb": round(before_total / 2 ** 20, 1),
+        "after_mb": round(after_total / 2 ** 20, 1),
+        "reduction": round(1 - after_total / before_total, 3) if before_total else None,
+        "before_load_s": round(before_s, 2),
+        "after_load_s": round(after_s, 2),
+        "columns": {
+            column: {
+                "before_mb": round(int(before.get(column, 0)) / 2 ** 20, 2),
+                "after_mb": round(int(after[column]) / 2 ** 20, 2),
+                "before_dtype": str(before_df[column].dtype) if column in before_df else None,
+                "after_dtype": str(after_df[column].dtype),
+            }
+            for column in columns
+        },
+    }
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    tmp = None
+    directories = {"linkedin": args.linkedin, "telegram": args.telegram, "emails": args.emails}
+    if not any(directories.values()):
+        tmp = tempfile.TemporaryDirectory()
+        print(f"Writing {args.rows} synthetic rows per source to {tmp.name} ...")
+        directories = {source: os.path.join(tmp.name, source) for source in directories}
+        _write(make_linkedin(rng, args.rows, args.files), directories["linkedin"], args.files)
+        _write(make_telegram(rng, args.rows, args.files), directories["telegram"], args.files)
+        _write(make_emails(rng, max(1, args.rows // 10)), directories["emails"], max(1, args.files // 10))
+
+    sources = (
+        ("linkedin", LINKEDIN_PROCESSED_SCHEMA, True),
+        ("telegram", TELEGRAM_PROCESSED_SCHEMA, True),
+        ("emails", EMAILS_DATABASE_SCHEMA, False),  # Same parse_dates as the dashboard loads
+    )
+    result = {}
+    try:
+        for source, schema, parse_dates in sources:
+            if directories[source]:
+                result[source] = report(source, directories[source], schema, parse_dates)
+                summary = {key: value for key, value in result[source].items() if key != "columns"}
+                print(f"{source}: {summary}")
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"Results saved to {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory of the processed frames with inferred vs declared dtypes")
+    parser.add_argument("--rows", type=int, default=500_000, help="Synthetic rows per source (emails: a tenth)")
+    parser.add_argument("--files", type=int, default=200, help="Synthetic CSV files per source")
+    parser.add_argument("--linkedin", default=None, help="Processed LinkedIn directory to measure instead")
+    parser.add_argument("--telegram", default=None, help="Processed Telegram directory to measure instead")
+    parser.add_argument("--emails", default=None, help="Emails database directory to measure instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    main(parser.parse_args())
@@ -0,0 +1,93 @@
+import argparse
+import json
+import random
+import time
+
+import pandas as pd
+
+from data_processing import CSVProcessorBase, extract_column, EMAIL_REGEX, URL_REGEX
+
+# ----------------- Email/link extraction benchmark -------------------- #
+#
+# Times the per-row `apply(lambda x: pd.Series(...))` extraction CSVProcessorBase used
+# to run against the vectorized `extract_column`, on synthetic posts shaped like the
+# scraped ones, and checks both produce the same columns. Run from the repository root:
+#
+#   python -m benchmarks.extraction --rows 1000000 --legacy-rows 100000 --output extraction.json
+
+WORDS = ("hiring", "developer", "remote", "salary", "apply", "team", "experience", "python", "data", "urgent")
+
+
+def make_posts(rows, seed=0):
+    """Posts of 20-60 words; about a third carry an email, a third a link, some neither, some missing"""
+    rng = random.Random(seed)
+    posts = []
+    for i in range(rows):
+        words = rng.choices(WORDS, k=rng.randint(20, 60))
+        roll = rng.random()
+        if roll < 0.33:
+            words.insert(rng.randrange(len(words)), f"hr{i}@company{i % 97}.com")
+        if 0.25 < roll < 0.6:
+            words.append(f"https://jobs.example.com/{i}?ref=li")
+        posts.append(None if roll > 0.98 else " ".join(words))
+    return pd.Series(posts, dtype=object).fillna("-")  # The processor fills missing values first
+
+
+def legacy(texts):
+    processor = CSVProcessorBase(".", ".")
+    emails = texts.apply(lambda x: pd.Series(processor.extract_emails(x)))
+    links = texts.apply(lambda x: pd.Series(processor.extract_links(x)))
+    return emails[0], emails[1], links[0], links[1]
+
+
+def vectorized(texts):
+    emails, email_count = extract_column(texts, EMAIL_REGEX, '@')
+    links, link_count = extract_column(texts, URL_REGEX, 'http')
+    return emails, email_count, links, link_count
+
+
+def timed(function, texts):
+    start = time.perf_counter()
+    result = function(texts)
+    return result, time.perf_counter() - start
+
+
+def main(args):
+    texts = make_posts(args.rows, args.seed)
+    new_result, new_time = timed(vectorized, texts)
+
+    legacy_rows = min(args.legacy_rows or args.rows, args.rows)
+    sample = texts.iloc[:legacy_rows]
+    old_result, old_time = timed(legacy, sample)
+    for old, new in zip(old_result, new_result):
+        if list(old) != list(new.iloc[:legacy_rows]):
+            raise AssertionError("Vectorized extraction differs from the per-row extraction")
+    legacy_estimate = old_time * args.rows / legacy_rows  # Per-row cost is flat, so it scales linearly
+
+    result = {
+        "rows": args.rows,
+        "vectorized_s": round(new_time, 2),
+        "legacy_rows": legacy_rows,
+        "legacy_s": round(old_time, 2),
+        "legacy_s_for_all_rows": round(legacy_estimate, 2),
+        "speedup": round(legacy_estimate / new_time, 1) if new_time else None,
+        "emails_found": int(new_result[1].sum()),
+        "links_found": int(new_result[3].sum()),
+    }
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results saved to {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-row vs vectorized email/link extraction")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=None,
+                        help="Time the per-row version on the first N rows only and scale up (default: all rows)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    main(parser.parse_args())
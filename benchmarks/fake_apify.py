@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import base64
+import gzip
+import json
+import random
+import string
+import time
+from datetime import datetime, timezone
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+# ----------------- Offline Apify stand-in -------------------- #
+#
+# Mimics the parts of the Apify API the scrapers use: starting (and calling) actors,
+# run status READY -> RUNNING -> SUCCEEDED/FAILED after a random latency, aborting runs,
+# completion webhooks and paginated dataset items (none for LinkedIn runs whose cookie
+# value is "expired"). Point the managers at it with
+# `api_url` (or APIFY_API_URL) to measure them without network or credits.
+#
+#   python -m benchmarks.fake_apify --port 8765 --min-latency 1 --max-latency 3 --failure-rate 0.05
+
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+
+
+def _new_id():
+    return "".join(random.choices(string.ascii_letters + string.digits, k=17))
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class FakeApify:
+    """In-memory runs and datasets behind the fake API"""
+
+    def __init__(self, min_latency=1.0, max_latency=3.0, failure_rate=0.0, throttle_rate=0.0,
+                 items_per_input=20, startup_delay=0.2):
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.failure_rate = failure_rate  # Share of runs that end FAILED
+        self.throttle_rate = throttle_rate  # Share of run starts answered with HTTP 429
+        self.items_per_input = items_per_input  # Items per LinkedIn URL (Telegram: one per post, capped)
+        self.startup_delay = startup_delay  # Seconds a run stays READY
+        self.runs = {}
+        self.datasets = {}
+        self.stats = {"runs_started": 0, "runs_succeeded": 0, "runs_failed": 0, "runs_aborted": 0,
+                      "throttled": 0, "item_requests": 0, "items_served": 0, "max_running": 0}
+        self._webhook_client = None
+
+    # ---- runs ---- #
+
+    def start_run(self, actor_id, run_input, webhooks=None):
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            self.stats["throttled"] += 1
+            raise HTTPException(status_code=429, detail="rate-limit-exceeded")
+
+        now = time.time()
+        run_id, dataset_id = _new_id(), _new_id()
+        self.runs[run_id] = {
+            "id": run_id,
+            "actId": actor_id,
+            "defaultDatasetId": dataset_id,
+            "input": run_input,
+            "webhooks": webhooks or [],
+            "started": now,
+            "finishes": now + self.startup_delay + random.uniform(self.min_latency, self.max_latency),
+            "fails": random.random() < self.failure_rate,
+            "final_status": None,
+            "finished": None,
+        }
+        self.datasets[dataset_id] = []
+        self.stats["runs_started"] += 1
+        self.stats["max_running"] = max(self.stats["max_running"], self.running_count())
+        if webhooks:
+            asyncio.get_running_loop().create_task(self._fire_webhooks(run_id))
+        return self.run_info(run_id)
+
+    def running_count(self):
+        return sum(1 for run_id in self.runs if self.status(run_id) not in TERMINAL_STATUSES)
+
+    def status(self, run_id):
+        run = self.runs[run_id]
+        if run["final_status"]:
+            return run["final_status"]
+        now = time.time()
+        if now < run["started"] + self.startup_delay:
+            return "READY"
+        if now < run["finishes"]:
+            return "RUNNING"
+        self._finish(run, "FAILED" if run["fails"] else "SUCCEEDED")
+        return run["final_status"]
+
+    def _finish(self, run, status):
+        run["final_status"] = status
+        run["finished"] = min(time.time(), run["finishes"]) if status != "ABORTED" else time.time()
+        if status == "SUCCEEDED":
+            self.datasets[run["defaultDatasetId"]] = self._generate_items(run)
+        elif status == "ABORTED":
+            # Whatever was scraped before the abort stays in the dataset
+            items = self._generate_items(run)
+            share = (run["finished"] - run["started"]) / max(run["finishes"] - run["started"], 1e-9)
+            self.datasets[run["defaultDatasetId"]] = items[:int(len(items) * min(share, 1.0))]
+        self.stats[f"runs_{status.lower()}"] += 1
+
+    def abort(self, run_id):
+        if self.status(run_id) not in TERMINAL_STATUSES:
+            self._finish(self.runs[run_id], "ABORTED")
+        return self.run_info(run_id)
+
+    def run_info(self, run_id):
+        run = self.runs[run_id]
+        status = self.status(run_id)
+        return {
+            "id": run_id,
+            "actId": run["actId"],
+            "status": status,
+            "startedAt": _iso(run["started"]),
+            "finishedAt": _iso(run["finished"]) if run["finished"] else None,
+            "defaultDatasetId": run["defaultDatasetId"],
+            "defaultKeyValueStoreId": run["defaultDatasetId"],
+            "stats": {"computeUnits": round(((run["finished"] or time.time()) - run["started"]) / 3600, 6)},
+        }
+
+    async def wait_for_run(self, run_id, wait_secs):
+        deadline = time.monotonic() + min(wait_secs, 60)
+        while self.status(run_id) not in TERMINAL_STATUSES and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+    async def _fire_webhooks(self, run_id):
+        run = self.runs[run_id]
+        while self.status(run_id) not in TERMINAL_STATUSES:
+            await asyncio.sleep(max(run["finishes"] - time.time(), 0.01))
+        status = self.status(run_id)
+        event_type = f"ACTOR.RUN.{status.replace('-', '_')}"
+        payload = {"eventType": event_type, "eventData": {"actorRunId": run_id}, "resource": self.run_info(run_id)}
+        if self._webhook_client is None:
+            self._webhook_client = httpx.AsyncClient(timeout=10)
+        for webhook in run["webhooks"]:
+            if event_type in webhook.get("eventTypes", []):
+                try:
+                    await self._webhook_client.post(webhook["requestUrl"], json=payload)
+                except httpx.HTTPError:
+                    pass  # Apify retries; the scrapers' poller covers a lost webhook anyway
+
+    # ---- datasets ---- #
+
+    def _generate_items(self, run):
+        run_input = run["input"] or {}
+        scraped_at = run["finishes"]
+        if "urls" in run_input:  # LinkedIn post search
+            if any(cookie.get("value") == "expired" for cookie in run_input.get("cookie") or []
+                   if isinstance(cookie, dict)):
+                return []  # A logged-out session scrapes nothing but the run still succeeds
+            return [
+                {
+                    "inputUrl": url,
+                    "urn": f"urn:li:activity:{abs(hash((run['id'], url, n)))}",
+                    "url": f"https://www.linkedin.com/feed/update/{run['id']}-{i}-{n}",
+                    "authorName": f"Recruiter {n}",
+                    "authorProfileId": f"recruiter-{n}",
+                    "text": f"We are hiring #{n}. Send your CV to jobs{n}@example.com or apply at https://example.com/jobs/{n}",
+                    "postedAtTimestamp": int((scraped_at - 3600 * n) * 1000),
+                    "postedAtISO": _iso(scraped_at - 3600 * n),
+                }
+                for i, url in enumerate(run_input["urls"])
+                for n in range(self.items_per_input)
+            ]
+        if "channels" in run_input:  # Telegram channel posts
+            posts_from, posts_to = run_input.get("postsFrom", 1), run_input.get("postsTo", 1)
+            post_ids = range(posts_from, min(posts_to, posts_from + self.items_per_input - 1) + 1)
+            return [
+                {
+                    "id": post_id,
+                    "channel": channel,
+                    "text": f"Vacancy {post_id}: contact hr{post_id}@example.com https://t.me/{channel}/{post_id}",
+                    "date": _iso(scraped_at - 60 * post_id),
+                }
+                for channel in run_input["channels"]
+                for post_id in post_ids
+            ]
+        return [{"index": n} for n in range(self.items_per_input)]
+
+    def list_items(self, dataset_id, offset=0, limit=None):
+        items = self.datasets[dataset_id]
+        page = items[offset:offset + limit if limit else None]
+        self.stats["item_requests"] += 1
+        self.stats["items_served"] += len(page)
+        return page, len(items)
+
+    def snapshot(self):
+        return {**self.stats, "running": self.running_count(), "runs": len(self.runs)}
+
+
+def _decode_webhooks(encoded):
+    if not encoded:
+        return None
+    return json.loads(base64.b64decode(encoded).decode("utf-8"))
+
+
+def create_app(fake=None):
+    """FastAPI app serving the `/v2` routes the Apify client calls, plus `/_stats`"""
+    fake = fake or FakeApify()
+    app = FastAPI()
+    app.state.fake = fake
+
+    def run_or_404(run_id):
+        if run_id not in fake.runs:
+            raise HTTPException(status_code=404, detail="record-not-found")
+        return run_id
+
+    @app.exception_handler(HTTPException)
+    async def apify_error(request, exc):
+        return JSONResponse(status_code=exc.status_code, content={"error": {"type": exc.detail, "message": exc.detail}})
+
+    @app.post("/v2/acts/{actor_id}/runs")
+    async def start_actor(actor_id: str, request: Request, webhooks: str | None = None, waitForFinish: int = 0):
+        body = await request.body()
+        if request.headers.get("content-encoding") == "gzip":  # The Apify client gzips JSON bodies
+            body = gzip.decompress(body)
+        run_info = fake.start_run(actor_id, json.loads(body) if body else {}, _decode_webhooks(webhooks))
+        if waitForFinish:
+            await fake.wait_for_run(run_info["id"], waitForFinish)
+            run_info = fake.run_info(run_info["id"])
+        return JSONResponse(status_code=201, content={"data": run_info})
+
+    @app.get("/v2/actor-runs/{run_id}")
+    async def get_run(run_id: str, waitForFinish: int = 0):
+        run_or_404(run_id)
+        if waitForFinish:
+            await fake.wait_for_run(run_id, waitForFinish)
+        return {"data": fake.run_info(run_id)}
+
+    @app.post("/v2/actor-runs/{run_id}/abort")
+    async def abort_run(run_id: str):
+        return {"data": fake.abort(run_or_404(run_id))}
+
+    @app.get("/v2/datasets/{dataset_id}/items")
+    async def list_items(dataset_id: str, offset: int = 0, limit: int | None = None):
+        if dataset_id not in fake.datasets:
+            raise HTTPException(status_code=404, detail="record-not-found")
+        page, total = fake.list_items(dataset_id, offset, limit)
+        headers = {
+            "x-apify-pagination-total": str(total),
+            "x-apify-pagination-offset": str(offset),
+            "x-apify-pagination-count": str(len(page)),
+            "x-apify-pagination-limit": str(limit or 999999999999),
+            "x-apify-pagination-desc": "",
+        }
+        return JSONResponse(content=page, headers=headers)
+
+    @app.get("/_stats")
+    async def stats():
+        return fake.snapshot()
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Apify API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--min-latency", type=float, default=1.0, help="Seconds a run takes, at least")
+    parser.add_argument("--max-latency", type=float, default=3.0, help="Seconds a run takes, at most")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of runs that end FAILED")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of run starts answered with 429")
+    parser.add_argument("--items", type=int, default=20, help="Dataset items per input")
+    args = parser.parse_args()
+
+    fake = FakeApify(min_latency=args.min_latency, max_latency=args.max_latency, failure_rate=args.failure_rate,
+                     throttle_rate=args.throttle_rate, items_per_input=args.items)
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import contextlib
+import glob
+import io
+import json
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import httpx
+
+from scrap_manager import LinkedInScraperManager, TelegramScraperManager
+from crawlers.run_events import run_hub
+from crawlers.api_quota import apify_quota
+from crawlers.scrape_ledger import ScrapeLedger
+from crawlers.raw_store import RawStore
+
+# ----------------- Scraper manager load benchmark -------------------- #
+#
+# Drives LinkedInScraperManager and TelegramScraperManager against the offline Apify
+# stand-in (benchmarks/fake_apify.py, started as a subprocess) and reports runs per
+# minute, items per second, peak thread count and peak traced memory per scenario.
+# Run from the repository root:
+#
+#   python -m benchmarks.manager_load --sizes 10 100 1000 --output bench.json
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_apify(port, args):
+    """Starts the fake API in a subprocess (so it doesn't count towards our threads/memory) and waits for it"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_apify", "--port", str(port),
+         "--min-latency", str(args.min_latency), "--max-latency", str(args.max_latency),
+         "--failure-rate", str(args.failure_rate), "--throttle-rate", str(args.throttle_rate),
+         "--items", str(args.items)],
+        cwd=REPO_ROOT,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/_stats", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Fake Apify server did not start")
+
+
+async def start_webhook_receiver(port):
+    """Minimal HTTP endpoint standing in for server.py's /apify/webhook route"""
+    async def handle(reader, writer):
+        try:
+            headers = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+            length = next((int(line.split(":", 1)[1]) for line in headers.split("\r\n")
+                           if line.lower().startswith("content-length:")), 0)
+            payload = json.loads(await reader.readexactly(length)) if length else {}
+            run_info = payload.get("resource") or {}
+            run_id = run_info.get("id") or payload.get("eventData", {}).get("actorRunId")
+            if run_id:
+                run_hub.notify(run_id, run_info)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", port)
+
+
+def build_manager(name, n_inputs, workdir, api_url, webhook_url, args):
+    common = dict(
+        api_token="fake-token",
+        save_path=workdir,
+        time_limit=args.time_limit,
+        webhook_url=webhook_url,
+        api_url=api_url,
+        max_in_flight_runs=args.max_in_flight,
+        adaptive_concurrency=not args.fixed_concurrency,
+        ledger=ScrapeLedger(os.path.join(workdir, "ledger.db")),
+        raw_store=RawStore(os.path.join(workdir, "store")) if args.raw_store else None,
+    )
+    if name == "linkedin":
+        urls_path = os.path.join(workdir, "urls.txt")
+        with open(urls_path, "w", encoding="utf-8") as f:
+            for i in range(n_inputs):
+                f.write(f"https://www.linkedin.com/search/results/content/?keywords=bench%20{i}\n")
+        return LinkedInScraperManager(cookies=[], keywords_path=None, urls_path=urls_path, csv_keywords=None,
+                                      search_with_keywords=False, generate_combinations=False,
+                                      max_workers=args.workers, batch_size=args.batch_size, **common)
+    channels = [f"bench_channel_{i}" for i in range(n_inputs)]
+    return TelegramScraperManager(channels=channels, posts_from=1, posts_to=args.items,
+                                  max_workers=args.workers, **common)
+
+
+async def fake_stats(client, api_url):
+    return (await client.get(f"{api_url}/_stats")).json()
+
+
+async def run_scenario(name, n_inputs, api_url, webhook_url, args):
+    workdir = tempfile.mkdtemp(prefix=f"bench_{name}_{n_inputs}_")
+    manager = build_manager(name, n_inputs, workdir, api_url, webhook_url, args)
+    logging.getLogger("apify_client").setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+
+    async with httpx.AsyncClient() as client:
+        before = await fake_stats(client, api_url)
+        peak_threads = threading.active_count()
+        stop_sampling = asyncio.Event()
+
+        async def sample_threads():
+            nonlocal peak_threads
+            while not stop_sampling.is_set():
+                peak_threads = max(peak_threads, threading.active_count())
+                await asyncio.sleep(0.05)
+
+        sampler = asyncio.create_task(sample_threads())
+        tracemalloc.start()
+        start_time = time.monotonic()
+        output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            await manager.start_scraping()
+        elapsed = time.monotonic() - start_time
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        stop_sampling.set()
+        await sampler
+        after = await fake_stats(client, api_url)
+
+    items = 0
+    for filename in glob.glob(os.path.join(glob.escape(workdir), "*_results.jsonl")):
+        with open(filename, "rb") as f:
+            items += sum(1 for _ in f)
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    runs = {key: after[key] - before[key] for key in ("runs_started", "runs_succeeded", "runs_failed", "throttled")}
+    finished = runs["runs_succeeded"] + runs["runs_failed"]
+    return {
+        "manager": name,
+        "inputs": n_inputs,
+        "runs": runs["runs_started"],
+        "failed_runs": runs["runs_failed"],
+        "throttled": runs["throttled"],
+        "elapsed_s": round(elapsed, 2),
+        "runs_per_min": round(finished / elapsed * 60, 1) if elapsed else 0.0,
+        "items": items,
+        "items_per_s": round(items / elapsed, 1) if elapsed else 0.0,
+        "peak_threads": peak_threads,
+        "peak_memory_mb": round(peak_memory / 1024 ** 2, 1),
+        "final_limit": manager.concurrency_snapshot()["limit"],
+        "workdir": workdir if args.keep else None,
+    }
+
+
+def print_report(results):
+    columns = ["manager", "inputs", "runs", "failed_runs", "elapsed_s", "runs_per_min", "items",
+               "items_per_s", "peak_threads", "peak_memory_mb", "final_limit"]
+    widths = {column: max(len(column), *(len(str(result[column])) for result in results)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for result in results:
+        print("  ".join(str(result[column]).ljust(widths[column]) for column in columns))
+
+
+async def main(args):
+    port = args.port or _free_port()
+    api_url = f"http://127.0.0.1:{port}"
+    run_hub.min_interval = args.poll_interval
+    run_hub.max_interval = max(args.poll_interval, args.max_poll_interval)
+    apify_quota.configure(requests_per_second=args.requests_per_second, max_concurrent_runs=args.max_concurrent_runs,
+                          usage_path=None)  # Fake compute units must not count against the real budget
+
+    receiver, webhook_url = None, None
+    if args.webhooks:
+        webhook_port = _free_port()
+        receiver = await start_webhook_receiver(webhook_port)
+        webhook_url = f"http://127.0.0.1:{webhook_port}/apify/webhook"
+
+    process = await asyncio.to_thread(start_fake_apify, port, args)
+    results = []
+    try:
+        for name in args.managers:
+            for n_inputs in args.sizes:
+                result = await run_scenario(name, n_inputs, api_url, webhook_url, args)
+                print(f"{name} x {n_inputs}: {result['runs_per_min']} runs/min, {result['items_per_s']} items/s")
+                results.append(result)
+    finally:
+        process.terminate()
+        process.wait()
+        if receiver is not None:
+            receiver.close()
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"Results saved to {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load benchmark of the scraper managers against a fake Apify API")
+    parser.add_argument("--managers", nargs="+", default=["linkedin", "telegram"], choices=["linkedin", "telegram"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000], help="Inputs per scenario")
+    parser.add_argument("--port", type=int, default=None, help="Fake API port (default: any free port)")
+    parser.add_argument("--min-latency", type=float, default=1.0)
+    parser.add_argument("--max-latency", type=float, default=3.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--items", type=int, default=20, help="Items per input (Telegram: posts per channel)")
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=10, help="LinkedIn inputs per actor run")
+    parser.add_argument("--max-in-flight", type=int, default=10)
+    parser.add_argument("--requests-per-second", type=float, default=20, help="Process-wide API rate limit")
+    parser.add_argument("--max-concurrent-runs", type=int, default=25, help="Process-wide concurrent run cap")
+    parser.add_argument("--fixed-concurrency", action="store_true", help="Disable the AIMD controller")
+    parser.add_argument("--time-limit", type=float, default=None, help="Manager time limit in minutes")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Run status poll interval (s)")
+    parser.add_argument("--max-poll-interval", type=float, default=5.0)
+    parser.add_argument("--webhooks", action="store_true", help="Complete runs through webhooks instead of polling")
+    parser.add_argument("--raw-store", action="store_true", help="Write results to a Parquet raw store")
+    parser.add_argument("--keep", action="store_true", help="Keep the scenario output directories")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    asyncio.run(main(parser.parse_args()))
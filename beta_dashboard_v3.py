@@ -1,43 +1,27 @@
 import dash
 import math
 import re
-import os
 import ast
 import dash_bootstrap_components as dbc
 import pandas as pd
 from dash import html, dcc, Input, Output, State
 from datetime import datetime, timedelta
+from csv_ingest import load_and_concat_csvs
+from schemas import LINKEDIN_PROCESSED_SCHEMA, TELEGRAM_PROCESSED_SCHEMA, EMAILS_DATABASE_SCHEMA
 
 linkedin_path = "Processed_Data/linkedin_processed_data"
 telegram_path = "Processed_Data/telegram_processed_data"
 emails_path = "Processed_Data/emails_database"
 
-def load_and_concat_csvs(directory_path):
-    # Get a list of all CSV files in the specified directory
-    csv_files = [f for f in os.listdir(directory_path) if f.endswith('.csv')]
-    
-    # If no CSV files are found, return an empty DataFrame
-    if not csv_files:
-        return pd.DataFrame()
-
-    # Read each CSV file and store DataFrames in a list
-    dataframes = [pd.read_csv(os.path.join(directory_path, f)) for f in csv_files]
-    
-    # Concatenate all DataFrames along the rows (axis=0)
-    concatenated_df = pd.concat(dataframes, axis=0, ignore_index=True)
-    
-    
-    return concatenated_df
-
-df = load_and_concat_csvs(linkedin_path)
+df = load_and_concat_csvs(linkedin_path, schema=LINKEDIN_PROCESSED_SCHEMA, parse_dates=True)
 df['post_time'] = pd.to_datetime(df['postTime'])
 df['scraping_date'] = pd.to_datetime(df['scrappingDate'])
 
 
-t_df = load_and_concat_csvs(telegram_path)
+t_df = load_and_concat_csvs(telegram_path, schema=TELEGRAM_PROCESSED_SCHEMA, parse_dates=True)
 t_df['post_time'] = pd.to_datetime(t_df['postTime'])
 
-e_df = load_and_concat_csvs(emails_path)
+e_df = load_and_concat_csvs(emails_path, schema=EMAILS_DATABASE_SCHEMA)
 e_df["sectors"] = e_df["sectors"].apply(ast.literal_eval)
 
 # Valid credentials
@@ -234,6 +234,10 @@ class ScraperClientApp(QWidget):
         self.check_last_posts_btn = QPushButton("Check Last Posts")
         self.check_last_posts_btn.clicked.connect(self.check_channel_posts)
         layout.addWidget(self.check_last_posts_btn)
+
+        # Incremental mode: the server scrapes from the last scraped post up to the latest one
+        self.incremental_checkbox = QCheckBox("Incremental (only new posts since last scrape)")
+        layout.addWidget(self.incremental_checkbox)
         
         # Initial row count
         self.max_channels = 10
@@ -332,9 +336,12 @@ class ScraperClientApp(QWidget):
         for i, channel_input in enumerate(self.channel_inputs):
             channel_name = channel_input.text()
             if channel_name:
-                with client:
-                    num_posts = client.loop.run_until_complete(get_latest_post_number(channel_name))
-                    self.total_posts_labels[i].setText(f"Total Posts: {num_posts}")
+                try:
+                    with client:
+                        num_posts = client.loop.run_until_complete(get_latest_post_number(channel_name))
+                except Exception as e:
+                    num_posts = f"unknown ({e})"
+                self.total_posts_labels[i].setText(f"Total Posts: {num_posts}")
 
         
     ##########################################################
@@ -397,7 +404,7 @@ class ScraperClientApp(QWidget):
             
         data = self.collect_scraping_data(auto_process=False, linkedin_signal=False, channels=channels)
         
-        if not data["linkedin_signal"] and any(
+        if not data["t_incremental"] and any(
             (abs(from_val.value() - to_val.value()) > 1000 or abs(from_val.value() - to_val.value()) < 1)
             for from_val, to_val in zip(self.posts_from_inputs, self.posts_to_inputs)
         ):
@@ -475,6 +482,7 @@ class ScraperClientApp(QWidget):
             "t_channel": channels,
             "t_posts_from": [input.value() for input in self.posts_from_inputs],
             "t_posts_to": [input.value() for input in self.posts_to_inputs],
+            "t_incremental": self.incremental_checkbox.isChecked(),
         }
         return data
 
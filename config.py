@@ -5,8 +5,33 @@ APIFY_API_TOKEN = "###"
 #ME#
 OPENAI_TOKEN = "###"
 
+# Public URL Apify calls when a run finishes (server.py /apify/webhook). None = polling only
+APIFY_WEBHOOK_URL = None
+APIFY_WEBHOOK_SECRET = None  # Appended as ?token=... and checked by the webhook route; required for webhooks
+APIFY_API_URL = None  # None = https://api.apify.com; point at a local stand-in for offline runs
+APIFY_MAX_IN_FLIGHT_RUNS = 10  # Concurrent actor runs per manager, independent of worker count
+LINKEDIN_BATCH_SIZE = 10  # Keyword/URL inputs packed into one LinkedIn actor run
+SCRAPE_LEDGER_DB = "scrape_ledger.db"  # SQLite record of scraped inputs, used to skip/resume
+APIFY_REQUESTS_PER_SECOND = 20  # Process-wide rate of Apify API calls, shared by every manager
+APIFY_MAX_CONCURRENT_RUNS = 25  # Actor runs in flight across all managers (the account's limit)
+APIFY_MONTHLY_COMPUTE_UNITS = None  # Monthly compute-unit budget; None = unlimited
+APIFY_USAGE_FILE = "apify_usage.json"  # Compute units used this month, kept across restarts
+RAW_STORE_DIR = "Raw_Data/store"  # Parquet raw results partitioned by source/scrape date/keyword or channel
+KEYWORD_EXPLORE_RATIO = 0.1  # Share of LinkedIn inputs spent on keywords with too few runs to rank
+LINKEDIN_MAX_RUNS_PER_SESSION = 2  # Concurrent actor runs one LinkedIn account's cookies are used for
+LINKEDIN_SESSION_FAILURE_LIMIT = 3  # Failed/empty runs in a row before a session is quarantined
+LINKEDIN_SESSION_QUARANTINE = 1800  # Seconds a quarantined session sits out
+LOG_PATH = "job_seek.log"  # JSON-lines log of the server, scrapers and jobs_ai, tagged with request/run ids
+LOG_JSON_CONSOLE = False  # Console lines as JSON too (for log shippers) instead of plain text
+PROCESS_INCREMENTAL = True  # /process_data only ingests raw files not processed yet; each output gets only rows no earlier output has
+PROCESS_CHUNK_ROWS = 200000  # Raw rows processed at a time, bounding memory; None = the whole history at once
+EXCEL_EXPORT_WORKERS = 1  # Background threads building Excel copies of processed/GPT CSVs on request
+POST_INDEX_DB = "post_index.db"  # SimHash fingerprints of processed posts, for near-duplicates across runs and sources
+NEAR_DUPLICATE_THRESHOLD = 0.95  # Share of the 64 SimHash bits two posts must share to be near-duplicates
+NEAR_DUPLICATE_DROP = False  # Drop near-duplicate posts from the processed output instead of tagging them (duplicateOf)
 
-cookies_path = "cookies.json"
+
+cookies_path = "cookies.json"  # One cookie list, a list of them or {account: cookie list}; or a folder of such files
 
 # # Open the JSON file and load its content
 # with open(cookies_path, "r", encoding="utf-8") as file:
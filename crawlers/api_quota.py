@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# ----------------- Apify API quota -------------------- #
+
+class QuotaExceededError(Exception):
+    """Raised when starting a run would go over the monthly compute-unit budget"""
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate  # None/0 = unlimited
+        self.capacity = capacity or max(1, rate or 1)
+        self.tokens = self.capacity
+        self.waits = 0  # Calls that had to wait for a token
+        self._updated = time.monotonic()
+        self._lock = None
+        self._loop = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens=1):
+        if not self.rate:
+            return
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # asyncio primitives belong to one event loop
+            self._lock, self._loop = asyncio.Lock(), loop
+        async with self._lock:  # Waiters are served in arrival order
+            self._refill()
+            if self.tokens < tokens:
+                self.waits += 1
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+class ApifyQuota:
+    """
+    Process-wide limits on the Apify API, shared by every backend: a token bucket every
+    API call waits on, a cap on concurrent actor runs across all managers, and a monthly
+    compute-unit budget. Compute units of finished runs are persisted in `usage_path`, so
+    the budget survives restarts; `usage()` reports the current state for the server.
+    """
+
+    def __init__(self, requests_per_second=20, burst=None, max_concurrent_runs=25, monthly_compute_units=None,
+                 usage_path="apify_usage.json"):
+        self.logger = logging.getLogger(__name__)
+        self.active_runs = set()
+        self._starting = 0  # Run slots taken by starts that have no run id yet
+        self._condition = None
+        self._loop = None
+        self._counted_runs = OrderedDict()  # Recently finished runs, so a run is only counted once
+        self.configure(requests_per_second, burst, max_concurrent_runs, monthly_compute_units, usage_path)
+
+    def configure(self, requests_per_second=20, burst=None, max_concurrent_runs=25, monthly_compute_units=None,
+                  usage_path="apify_usage.json"):
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.max_concurrent_runs = max_concurrent_runs
+        self.monthly_compute_units = monthly_compute_units  # None = no budget
+        self.usage_path = usage_path
+        self._usage = self._load_usage()
+
+    # ---- API calls ---- #
+
+    async def throttle(self):
+        """Waits for a token; call before every API request"""
+        await self.bucket.acquire()
+
+    # ---- Concurrent runs ---- #
+
+    def _get_condition(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._condition, self._loop = asyncio.Condition(), loop
+        return self._condition
+
+    @property
+    def runs_in_use(self):
+        return len(self.active_runs) + self._starting
+
+    async def acquire_run(self):
+        """Waits for a run slot; raises QuotaExceededError once the monthly budget is spent"""
+        if self.budget_exhausted():
+            raise QuotaExceededError(
+                f"Monthly Apify budget of {self.monthly_compute_units} compute units is spent "
+                f"({self.compute_units_used:.4g} used)"
+            )
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.runs_in_use < self.max_concurrent_runs)
+            self._starting += 1
+
+    def run_started(self, run_id):
+        self._starting -= 1
+        self.active_runs.add(run_id)
+
+    async def release_run(self, run_id=None):
+        """Frees the slot of a run that finished, or of a start (`run_id=None`) that failed; a no-op once released"""
+        if run_id is None:
+            self._starting = max(0, self._starting - 1)
+        elif run_id in self.active_runs:
+            self.active_runs.discard(run_id)
+        else:
+            return  # Started by an earlier process (resumed) or already released
+        condition = self._get_condition()
+        async with condition:
+            condition.notify_all()
+
+    async def run_finished(self, run_id, run_info):
+        """Frees the run's slot and adds its compute units to this month's usage"""
+        await self.release_run(run_id)
+        if run_id in self._counted_runs or (run_info or {}).get("stats") is None:
+            return  # Already counted, or its info could not be fetched (nothing to book)
+        self._counted_runs[run_id] = True
+        while len(self._counted_runs) > 10000:
+            self._counted_runs.popitem(last=False)
+        units = ((run_info or {}).get("stats") or {}).get("computeUnits") or 0
+        self._record_usage(units)
+
+    # ---- Compute-unit budget ---- #
+
+    @staticmethod
+    def _current_month():
+        return datetime.now().strftime("%Y-%m")
+
+    def _load_usage(self):
+        usage = {"month": self._current_month(), "compute_units": 0.0, "runs": 0}
+        if self.usage_path and os.path.exists(self.usage_path):
+            try:
+                with open(self.usage_path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+                if saved.get("month") == usage["month"]:
+                    usage.update(saved)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Could not read Apify usage from {self.usage_path}: {e}")
+        return usage
+
+    def _roll_month(self):
+        if self._usage["month"] != self._current_month():
+            self._usage = {"month": self._current_month(), "compute_units": 0.0, "runs": 0}
+
+    def _record_usage(self, units):
+        self._roll_month()
+        self._usage["compute_units"] += units
+        self._usage["runs"] += 1
+        if self.usage_path:
+            with open(self.usage_path, 'w', encoding='utf-8') as f:
+                json.dump(self._usage, f, indent=4)
+
+    @property
+    def compute_units_used(self):
+        self._roll_month()
+        return self._usage["compute_units"]
+
+    @property
+    def remaining_compute_units(self):
+        if self.monthly_compute_units is None:
+            return None
+        return max(0.0, self.monthly_compute_units - self.compute_units_used)
+
+    def budget_exhausted(self):
+        return self.monthly_compute_units is not None and self.remaining_compute_units <= 0
+
+    def average_units_per_run(self):
+        self._roll_month()
+        if not self._usage["runs"]:
+            return None
+        return self._usage["compute_units"] / self._usage["runs"]
+
+    def would_exceed(self, estimated_runs):
+        """True if `estimated_runs` more runs, at this month's average cost, would blow the budget"""
+        if self.monthly_compute_units is None:
+            return False
+        if self.budget_exhausted():
+            return True
+        average = self.average_units_per_run()
+        return average is not None and estimated_runs * average > self.remaining_compute_units
+
+    def usage(self):
+        """Current usage and limits, for the server"""
+        average = self.average_units_per_run()
+        return {
+            "month": self._usage["month"],
+            "compute_units_used": round(self.compute_units_used, 4),
+            "monthly_compute_units": self.monthly_compute_units,
+            "remaining_compute_units": self.remaining_compute_units,
+            "runs_finished": self._usage["runs"],
+            "average_units_per_run": round(average, 4) if average is not None else None,
+            "active_runs": len(self.active_runs),
+            "max_concurrent_runs": self.max_concurrent_runs,
+            "requests_per_second": self.bucket.rate,
+            "throttled_requests": self.bucket.waits,
+        }
+
+
+# Process-wide quota shared by every Apify backend; server.py configures it from config.py
+apify_quota = ApifyQuota()
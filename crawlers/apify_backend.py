@@ -0,0 +1,80 @@
+from apify_client import ApifyClientAsync
+from crawlers.api_quota import apify_quota
+
+# ----------------- Async Apify backend -------------------- #
+
+class ApifyAsyncBackend:
+    """
+    Thin coroutine wrapper around ApifyClientAsync shared by every scraper.
+    All calls go through one pooled httpx connection, so scaling the number of
+    workers costs coroutines instead of threads from the default executor.
+    Every call waits on the process-wide quota's rate limiter, and every run holds
+    one of its concurrent-run slots until `run_finished`.
+    """
+
+    def __init__(self, api_token, api_url=None, quota=None):
+        self.api_token = api_token
+        self.api_url = api_url
+        self.quota = quota or apify_quota
+        self.client = ApifyClientAsync(api_token, api_url=api_url)  # api_url=None means api.apify.com
+
+    async def start_actor(self, actor_id, run_input, webhooks=None):
+        """
+        Starts an actor run without waiting for it to finish and returns the run info.
+        Raises QuotaExceededError once the monthly compute-unit budget is spent.
+        """
+        await self.quota.acquire_run()
+        try:
+            await self.quota.throttle()
+            run = await self.client.actor(actor_id).start(run_input=run_input, webhooks=webhooks)
+        except BaseException:
+            await self.quota.release_run()
+            raise
+        self.quota.run_started(run["id"])
+        return run
+
+    async def run_finished(self, run_id, run_info):
+        """Releases the run's slot and books its compute units; call once the run is terminal"""
+        await self.quota.run_finished(run_id, run_info)
+
+    async def release_run(self, run_id):
+        """Releases the run's slot without booking it, e.g. when nobody will wait for it; a no-op once released"""
+        await self.quota.release_run(run_id)
+
+    async def get_run(self, run_id):
+        """Returns the current run info"""
+        await self.quota.throttle()
+        return await self.client.run(run_id).get()
+
+    async def abort_run(self, run_id, gracefully=False):
+        """Aborts the run; items it pushed so far stay in its dataset. Returns the run info"""
+        await self.quota.throttle()
+        return await self.client.run(run_id).abort(gracefully=gracefully)
+
+    async def list_items(self, dataset_id, offset=0, limit=100):
+        """Returns one page of dataset items"""
+        await self.quota.throttle()
+        return await self.client.dataset(dataset_id).list_items(offset=offset, limit=limit)
+
+    async def iter_item_pages(self, dataset_id, page_size=1000):
+        """Walks the whole dataset with offset/limit pages, yielding each page's items"""
+        offset = 0
+        while True:
+            page = await self.list_items(dataset_id, offset=offset, limit=page_size)
+            if not page.items:
+                return
+            yield page.items
+            offset += len(page.items)
+            if offset >= page.total:
+                return
+
+
+_backends = {}
+
+
+def get_apify_backend(api_token, api_url=None):
+    """Returns the process-wide backend for this token/API URL, creating it on first use"""
+    key = (api_token, api_url)
+    if key not in _backends:
+        _backends[key] = ApifyAsyncBackend(api_token, api_url=api_url)
+    return _backends[key]
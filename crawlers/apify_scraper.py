@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from crawlers.apify_backend import get_apify_backend
+from crawlers.log_setup import setup_logging
+from crawlers.run_events import run_hub, build_run_webhooks
+
+# ----------------- Actor Scraper Base -------------------- #
+
+class ApifyActorScraper:
+    """
+    What every actor scraper shares: starting a run on the shared backend, waiting for it,
+    aborting it and downloading its dataset. Subclasses only build the actor's input.
+    """
+
+    def __init__(self, api_token, webhook_url=None, webhook_poll_interval=30, api_url=None, page_size=1000):
+        self.backend = get_apify_backend(api_token, api_url=api_url)  # Shared across scrapers
+        self.webhook_url = webhook_url  # Public URL of server.py's /apify/webhook route
+        self.webhook_poll_interval = webhook_poll_interval
+        self.page_size = page_size  # Dataset items per request when downloading results
+        self.logger = self.setup_logger()
+
+    def setup_logger(self):
+        """Sets up the logger for Apify client; handlers live on the shared queue, so calling it again adds none"""
+        setup_logging()
+        logger = logging.getLogger('apify_client')
+        logger.setLevel(logging.DEBUG)
+        return logger
+
+    async def start_run(self, actor_id, run_input):
+        """Starts the actor with its completion webhooks and returns the run id"""
+        run = await self.backend.start_actor(actor_id, run_input, webhooks=build_run_webhooks(self.webhook_url))
+        return run["id"]
+
+    async def wait_for_run(self, run_id):
+        """Waits for the run's completion webhook, falling back to the shared adaptive poller, and returns the run info"""
+        self.logger.info(f"Scraping in progress... (Run ID: {run_id}) 🔃🔃")
+        # With a webhook configured the poller is only a safety net, so it can start slow
+        initial_interval = self.webhook_poll_interval if self.webhook_url else None
+        run_info = await run_hub.wait_for_run(run_id, self.get_run, initial_interval=initial_interval)
+        await self.backend.run_finished(run_id, run_info)
+        if run_info["status"] == "SUCCEEDED":
+            self.logger.info(f"Run {run_id} SUCCEEDED! ✅")
+        else:
+            self.logger.error(f"Run {run_id} {run_info['status']}! ❌")
+        return run_info
+
+    async def monitor_scraping(self, run_id):
+        """Waits for the run and returns its dataset id, or None if it did not succeed"""
+        run_info = await self.wait_for_run(run_id)
+        return run_info["defaultDatasetId"] if run_info["status"] == "SUCCEEDED" else None
+
+    async def get_run(self, run_id):
+        """Fetches the current run info asynchronously"""
+        return await self.backend.get_run(run_id)
+
+    async def abort_run(self, run_id):
+        """
+        Aborts the run through the API and returns its run info; a run that already finished is returned as is.
+        Returns None when the run can be neither aborted nor fetched.
+        """
+        try:
+            run_info = await self.backend.abort_run(run_id)
+        except Exception as e:
+            self.logger.warning(f"Aborting run {run_id} failed: {e}")
+            try:
+                run_info = await self.backend.get_run(run_id)
+            except Exception as e:
+                self.logger.warning(f"Fetching run {run_id} failed: {e}")
+                run_info = None
+        await self.backend.run_finished(run_id, run_info)
+        if run_info is None:
+            self.logger.error(f"Run {run_id} could not be aborted or fetched at the deadline ❌")
+            return None
+        self.logger.info(f"Run {run_id} {run_info['status']} at the deadline")
+        return run_info
+
+    async def fetch_results(self, dataset_id):
+        """Fetches and returns all scraped results asynchronously, page by page"""
+        items = []
+        async for page in self.backend.iter_item_pages(dataset_id, page_size=self.page_size):
+            items.extend(page)
+        return items
+
+    async def stream_results(self, dataset_id, sink):
+        """Streams the dataset page by page into `sink`, writing off the event loop, and returns the number of items"""
+        start_time = time.monotonic()
+        count = 0
+        async for page in self.backend.iter_item_pages(dataset_id, page_size=self.page_size):
+            await asyncio.to_thread(sink.write_page, page)
+            count += len(page)
+        elapsed = time.monotonic() - start_time
+        self.logger.info(f"Fetched {count} items from dataset {dataset_id} in {elapsed:.1f}s "
+                         f"({count / elapsed if elapsed else 0:.1f} items/s)")
+        return count
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from collections import deque
+
+# ----------------- Adaptive concurrency -------------------- #
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease limit on concurrent actor runs.
+    The limit grows by `increase_step` after a full round of healthy runs (run latency
+    close to the best seen, failure rate under `max_failure_rate`) and is cut by
+    `decrease_factor` on failed/aborted runs or HTTP 429 responses.
+    With `adaptive=False` it behaves like a fixed semaphore of `max_limit`.
+    """
+
+    def __init__(self, initial=2, min_limit=1, max_limit=10, increase_step=1, decrease_factor=0.5,
+                 latency_tolerance=1.5, max_failure_rate=0.2, window=20, cooldown=30,
+                 adaptive=True, history_size=200):
+        self.adaptive = adaptive
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = min(max(initial, min_limit), max_limit) if adaptive else max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.max_failure_rate = max_failure_rate
+        self.cooldown = cooldown  # Seconds; one burst of failures only counts as one decrease
+        self.in_use = 0
+        self.history = deque(maxlen=history_size)
+        self._outcomes = deque(maxlen=window)  # True for success, False for failure
+        self._latency_ewma = None
+        self._best_latency = None
+        self._successes_since_change = 0
+        self._last_decrease = 0
+        self._condition = asyncio.Condition()
+        self._record("init")
+
+    @property
+    def failure_rate(self):
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_use < self.limit)
+            self.in_use += 1
+
+    async def release(self):
+        async with self._condition:
+            self.in_use -= 1
+            self._condition.notify_all()
+
+    async def record_success(self, latency):
+        """Registers a run that succeeded after `latency` seconds"""
+        self._outcomes.append(True)
+        self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+        self._best_latency = min(self._best_latency or self._latency_ewma, self._latency_ewma)
+        if not self.adaptive or not self._healthy():
+            return
+
+        self._successes_since_change += 1
+        if self._successes_since_change >= self.limit and self.limit < self.max_limit:
+            await self._set_limit(self.limit + self.increase_step, "increase")
+
+    async def record_failure(self, reason):
+        """Registers a failed/aborted run or a rate-limited API call"""
+        self._outcomes.append(False)
+        if not self.adaptive or time.monotonic() - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = time.monotonic()
+        await self._set_limit(int(self.limit * self.decrease_factor), f"decrease: {reason}")
+
+    def _healthy(self):
+        latency_ok = self._latency_ewma <= self._best_latency * self.latency_tolerance
+        return latency_ok and self.failure_rate <= self.max_failure_rate
+
+    async def _set_limit(self, limit, reason):
+        limit = min(max(limit, self.min_limit), self.max_limit)
+        self._successes_since_change = 0
+        if limit == self.limit:
+            return
+        async with self._condition:
+            self.limit = limit
+            self._condition.notify_all()
+        self._record(reason)
+
+    def _record(self, reason):
+        self.history.append({
+            "time": time.time(),
+            "limit": self.limit,
+            "in_use": self.in_use,
+            "reason": reason,
+        })
+
+    def snapshot(self):
+        """Current state and limit history, for diagnostics"""
+        return {
+            "adaptive": self.adaptive,
+            "limit": self.limit,
+            "in_use": self.in_use,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "failure_rate": round(self.failure_rate, 3),
+            "latency_ewma": self._latency_ewma,
+            "history": list(self.history),
+        }
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+import os
+import time
+
+# ----------------- LinkedIn cookie pool -------------------- #
+
+class NoHealthySessionError(Exception):
+    """Raised when every LinkedIn session of the pool is quarantined"""
+
+
+class CookieSession:
+    """One LinkedIn account's cookies and its health"""
+
+    def __init__(self, name, cookies):
+        self.name = name
+        self.cookies = cookies
+        self.active_runs = 0
+        self.runs = 0
+        self.failed_runs = 0
+        self.empty_runs = 0
+        self.consecutive_failures = 0  # Failed or empty runs since the last good one
+        self.quarantined_until = None
+
+    def quarantined(self, now=None):
+        return self.quarantined_until is not None and (now or time.monotonic()) < self.quarantined_until
+
+
+class CookiePool:
+    """
+    Leases one LinkedIn session per in-flight actor run, so parallel runs spread over
+    several accounts instead of sharing one cookie. Each session runs at most
+    `max_runs_per_session` actor runs at a time; after `failure_limit` failed or empty
+    runs in a row it is quarantined for `quarantine_seconds` and then gets one more
+    chance (a single bad run sends it straight back). Leasing waits for a free session
+    and raises NoHealthySessionError once every session is quarantined.
+    """
+
+    def __init__(self, sessions, max_runs_per_session=2, failure_limit=3, quarantine_seconds=1800):
+        self.logger = logging.getLogger(__name__)
+        self.sessions = [
+            session if isinstance(session, CookieSession) else CookieSession(f"session-{i + 1}", session)
+            for i, session in enumerate(sessions)
+        ]
+        self.max_runs_per_session = max_runs_per_session
+        self.failure_limit = failure_limit
+        self.quarantine_seconds = quarantine_seconds
+        self._condition = None
+        self._loop = None
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """
+        Reads sessions from a JSON file or a directory of them. A file holds one cookie
+        list (exported from the browser), a list of cookie lists, or {name: cookie list}.
+        """
+        files = [path]
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".json"))
+        sessions = []
+        for file_path in files:
+            if not os.path.exists(file_path):
+                logging.getLogger(__name__).warning(f"Cookie file {file_path} not found")
+                continue
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            if isinstance(data, dict):
+                sessions.extend(CookieSession(name, cookies) for name, cookies in data.items())
+            elif data and all(isinstance(entry, list) for entry in data):
+                sessions.extend(CookieSession(f"{stem}-{i + 1}", cookies) for i, cookies in enumerate(data))
+            else:
+                sessions.append(CookieSession(stem, data))
+        return cls(sessions, **kwargs)
+
+    def _get_condition(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # asyncio primitives belong to one event loop
+            self._condition, self._loop = asyncio.Condition(), loop
+        return self._condition
+
+    def _free_session(self):
+        """Least busy healthy session with room for another run, None if all are busy"""
+        now = time.monotonic()
+        healthy = [session for session in self.sessions if not session.quarantined(now)]
+        if not healthy:
+            raise NoHealthySessionError(f"All {len(self.sessions)} LinkedIn sessions are quarantined or missing")
+        free = [session for session in healthy if session.active_runs < self.max_runs_per_session]
+        return min(free, key=lambda session: (session.active_runs, session.runs), default=None)
+
+    async def lease(self):
+        """Waits for a session with room for another run and takes a slot on it"""
+        condition = self._get_condition()
+        async with condition:
+            session = self._free_session()
+            while session is None:
+                await condition.wait()
+                session = self._free_session()
+            session.active_runs += 1
+            session.runs += 1
+            return session
+
+    async def release(self, session, succeeded=None, items=None):
+        """
+        Gives the session's slot back. `succeeded`/`items` describe the run it was leased
+        for (None when the run never started or its outcome is unknown).
+        """
+        if session is None:
+            return  # Run resumed from the ledger, started by an earlier process
+        session.active_runs -= 1
+        if succeeded is None:
+            session.runs -= 1
+        elif succeeded and items:
+            session.consecutive_failures = 0
+            session.quarantined_until = None
+        else:
+            if succeeded:
+                session.empty_runs += 1
+            else:
+                session.failed_runs += 1
+            session.consecutive_failures += 1
+            if session.consecutive_failures >= self.failure_limit:
+                session.quarantined_until = time.monotonic() + self.quarantine_seconds
+                self.logger.warning(f"LinkedIn session {session.name} quarantined for {self.quarantine_seconds}s "
+                                    f"after {session.consecutive_failures} failed or empty runs")
+        condition = self._get_condition()
+        async with condition:
+            condition.notify_all()
+
+    def snapshot(self):
+        """State of every session (never the cookies), for the server"""
+        now = time.monotonic()
+        return [
+            {
+                "name": session.name,
+                "active_runs": session.active_runs,
+                "runs": session.runs,
+                "failed_runs": session.failed_runs,
+                "empty_runs": session.empty_runs,
+                "consecutive_failures": session.consecutive_failures,
+                "quarantined_for_s": round(session.quarantined_until - now) if session.quarantined(now) else 0,
+            }
+            for session in self.sessions
+        ]
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+# ----------------- Scrape deadline -------------------- #
+
+class ScrapeDeadline:
+    """
+    Soft/hard deadline pair for one scrape. Past the soft deadline (`drain_time` seconds
+    before the time limit) no new run is launched and in-flight runs may still finish;
+    at the hard deadline the manager aborts what is left and flushes partial datasets.
+    Inputs that were dropped or only partially scraped are collected for the summary.
+    """
+
+    def __init__(self, time_limit, drain_time=60):
+        self.time_limit = time_limit  # Minutes; None/0 means no deadline
+        self.drain_time = drain_time
+        self.soft_deadline = None
+        self.hard_deadline = None
+        self.not_launched = []
+        self.not_fed = 0
+        self.aborted_runs = []
+
+    def start(self):
+        if not self.time_limit:
+            return
+        limit = self.time_limit * 60
+        self.hard_deadline = time.monotonic() + limit
+        self.soft_deadline = self.hard_deadline - min(self.drain_time, limit / 2)
+
+    @property
+    def timeout(self):
+        """Seconds until the hard deadline, None without a time limit"""
+        if self.hard_deadline is None:
+            return None
+        return max(0, self.hard_deadline - time.monotonic())
+
+    def launching_stopped(self):
+        return self.soft_deadline is not None and time.monotonic() >= self.soft_deadline
+
+    async def acquire_slot(self, multiplexer, inputs):
+        """
+        Waits for a run slot unless launching has stopped. Returns False (and records the
+        inputs as not launched) when the soft deadline passed before or while waiting.
+        """
+        if not self.launching_stopped():
+            try:
+                await multiplexer.acquire_slot()
+            except asyncio.CancelledError:
+                self.drop(inputs)  # Hard deadline hit while waiting
+                raise
+            if not self.launching_stopped():
+                return True
+            await multiplexer.release_slot()
+        self.drop(inputs)
+        return False
+
+    def drop(self, inputs):
+        """Records inputs that were never launched"""
+        self.not_launched.extend(inputs)
+
+    def record_abort(self, run_id, inputs, status, item_count):
+        """Records a run cut at the hard deadline and how many items were saved from it"""
+        self.aborted_runs.append({"run_id": run_id, "inputs": inputs, "status": status, "saved_items": item_count})
+
+    @property
+    def dropped_anything(self):
+        return bool(self.not_launched or self.not_fed or self.aborted_runs)
+
+    def summary(self):
+        return {
+            "time_limit_minutes": self.time_limit,
+            "drain_time_seconds": self.drain_time,
+            "not_launched": self.not_launched,
+            "not_fed": self.not_fed,  # Inputs still in the input file when the feeder stopped
+            "aborted_runs": self.aborted_runs,
+        }
+
+    def save_summary(self, directory, source):
+        """Writes the summary next to the raw results and returns its path"""
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory, f"{source}_deadline_summary_{timestamp}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"source": source, "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                       **self.summary()}, f, ensure_ascii=False, indent=4)
+        return path
@@ -0,0 +1,183 @@
+import random
+import re
+from collections import defaultdict, deque
+from datetime import datetime
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, func
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+Base = declarative_base()
+
+EMAIL_REGEX = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')  # Same pattern as data_processing
+
+# ----------------- Keyword yield -------------------- #
+
+class KeywordYield(Base):
+    __tablename__ = "keyword_yield"
+
+    keyword = Column(String, primary_key=True)
+    runs = Column(Integer, nullable=False, default=0)  # Runs the keyword took part in
+    posts = Column(Integer, nullable=False, default=0)
+    email_posts = Column(Integer, nullable=False, default=0)  # Posts with at least one email
+    new_emails = Column(Integer, nullable=False, default=0)  # Emails no keyword had found before
+    compute_units = Column(Float, nullable=False, default=0.0)  # Its share of the runs' compute units
+    last_scraped = Column(DateTime, nullable=True)
+
+
+class SeenEmail(Base):
+    __tablename__ = "seen_emails"
+
+    email = Column(String, primary_key=True)
+    keyword = Column(String, nullable=True)  # Keyword that found it first
+    first_seen = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class YieldTally:
+    """Per-keyword yield of one run, filled while its dataset is streamed (a SplitResultsSink observer)"""
+
+    def __init__(self):
+        self.posts = defaultdict(int)
+        self.email_posts = defaultdict(int)
+        self.emails = defaultdict(set)
+
+    def __call__(self, keyword, items):
+        if keyword is None:
+            return  # Items that match no input of the batch
+        for item in items:
+            text = item.get('text')
+            emails = EMAIL_REGEX.findall(text) if isinstance(text, str) else []
+            self.posts[keyword] += 1
+            if emails:
+                self.email_posts[keyword] += 1
+                self.emails[keyword].update(email.lower() for email in emails)
+
+
+class KeywordScheduler:
+    """
+    Orders keywords by expected yield (new unique emails) per compute unit, learned from
+    every run. Scores are smoothed towards the average keyword, so a keyword needs a few
+    runs before it ranks far from it; `explore_ratio` of the order is reserved for keywords
+    with fewer than `min_samples` runs, least sampled first, so new combinations get tried.
+    Methods are blocking SQLite I/O; the managers call them through asyncio.to_thread.
+    """
+
+    def __init__(self, db_path="scrape_ledger.db", explore_ratio=0.1, min_samples=2, seed=None):
+        self.engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.explore_ratio = explore_ratio
+        self.min_samples = min_samples
+        self.random = random.Random(seed)
+
+    def record_run(self, tally, compute_units, keywords):
+        """
+        Books a run's yield for its `keywords`. Compute units are shared out by the posts each
+        keyword brought (evenly when the run found nothing).
+        """
+        total_posts = sum(tally.posts[keyword] for keyword in keywords)
+        now = datetime.now()
+        with self.Session() as session, session.begin():
+            for keyword in keywords:
+                emails = list(tally.emails.get(keyword, ()))
+                known = set()
+                for i in range(0, len(emails), 500):  # Stay under SQLite's bound-parameter limit
+                    rows = session.query(SeenEmail.email).filter(SeenEmail.email.in_(emails[i:i + 500]))
+                    known.update(row.email for row in rows)
+                new_emails = set(emails) - known
+                session.add_all(SeenEmail(email=email, keyword=keyword, first_seen=now) for email in new_emails)
+
+                share = tally.posts[keyword] / total_posts if total_posts else 1 / len(keywords)
+                entry = session.get(KeywordYield, keyword)
+                if entry is None:
+                    entry = KeywordYield(keyword=keyword, runs=0, posts=0, email_posts=0, new_emails=0,
+                                         compute_units=0.0)
+                    session.add(entry)
+                entry.runs += 1
+                entry.posts += tally.posts[keyword]
+                entry.email_posts += tally.email_posts[keyword]
+                entry.new_emails += len(new_emails)
+                entry.compute_units += (compute_units or 0) * share
+                entry.last_scraped = now
+                session.flush()  # Emails found by this keyword are "known" for the next one
+
+    def _stats(self, keywords=None):
+        """(runs, new emails, compute units) of every keyword, or only of `keywords`"""
+        with self.Session() as session:
+            if keywords is None:
+                entries = session.query(KeywordYield).all()
+            else:
+                keywords, entries = list(keywords), []
+                for i in range(0, len(keywords), 500):  # Stay under SQLite's bound-parameter limit
+                    entries += session.query(KeywordYield).filter(KeywordYield.keyword.in_(keywords[i:i + 500]))
+            return {entry.keyword: (entry.runs, entry.new_emails, entry.compute_units) for entry in entries}
+
+    def _totals(self):
+        """(runs, new emails, compute units) summed over every keyword, for the priors"""
+        with self.Session() as session:
+            totals = session.query(func.sum(KeywordYield.runs), func.sum(KeywordYield.new_emails),
+                                   func.sum(KeywordYield.compute_units)).one()
+            return tuple(total or 0 for total in totals)
+
+    def scores(self, stats=None, totals=None):
+        """
+        Expected new emails per compute unit (per run when no compute units were reported) of the
+        keywords in `stats` (all by default), smoothed with priors from every keyword's `totals`.
+        """
+        stats = self._stats() if stats is None else stats
+        runs, new_emails_total, units = self._totals() if totals is None else totals
+        if not runs:
+            return {}
+        use_units = units > 0
+        # One average run worth of pseudo-observations pulls sparse keywords towards the mean
+        prior_yield = new_emails_total / runs
+        prior_cost = units / runs if use_units else 1.0
+        return {
+            keyword: (new_emails + prior_yield) / ((compute_units if use_units else keyword_runs) + prior_cost)
+            for keyword, (keyword_runs, new_emails, compute_units) in stats.items()
+        }
+
+    def order(self, keywords):
+        """
+        Keywords (deduplicated) best expected yield first, interleaved with low-sample exploration.
+        Only the stats of `keywords` are loaded, so a large input file is ranked a window at a time.
+        """
+        keywords = list(dict.fromkeys(keywords))
+        stats = self._stats(keywords)
+        scores = self.scores(stats)
+        exploit, explore = [], []
+        for keyword in keywords:
+            runs = stats.get(keyword, (0,))[0]
+            if runs < self.min_samples:
+                explore.append((runs, self.random.random(), keyword))
+            else:
+                exploit.append((-scores[keyword], keyword))
+        exploit = deque(keyword for _, keyword in sorted(exploit))
+        explore = deque(keyword for _, _, keyword in sorted(explore))
+
+        if not exploit or not explore or not self.explore_ratio:
+            return list(exploit) + list(explore)
+        ordered = []
+        every = max(1, round(1 / self.explore_ratio))  # Every n-th slot goes to exploration
+        while exploit and explore:
+            ordered.append(explore.popleft() if len(ordered) % every == every - 1 else exploit.popleft())
+        return ordered + list(exploit) + list(explore)
+
+    def report(self, limit=50):
+        """Best keywords by score with their yield, for diagnostics"""
+        stats = self._stats()
+        scores = self.scores(stats)
+        ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+        with self.Session() as session:
+            entries = {entry.keyword: entry for entry in
+                       session.query(KeywordYield).filter(KeywordYield.keyword.in_(ranked))}
+        return [
+            {
+                "keyword": keyword,
+                "score": round(scores[keyword], 4),
+                "runs": entries[keyword].runs,
+                "posts": entries[keyword].posts,
+                "email_posts": entries[keyword].email_posts,
+                "new_emails": entries[keyword].new_emails,
+                "compute_units": round(entries[keyword].compute_units, 4),
+            }
+            for keyword in ranked
+        ]
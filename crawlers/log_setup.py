@@ -0,0 +1,109 @@
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime
+
+# ----------------- Central logging -------------------- #
+#
+# Every module logs through the root logger, whose only handler is a QueueHandler:
+# the caller (often the event loop) just enqueues the record and a QueueListener
+# thread does the console/file I/O. setup_logging() is idempotent, so scrapers,
+# the server and jobs_ai can all call it; each log file is added once.
+
+request_id_var = contextvars.ContextVar("request_id", default=None)
+run_id_var = contextvars.ContextVar("run_id", default=None)
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s%(context)s'
+
+
+class ContextFilter(logging.Filter):
+    """Stamps records with the request/run id of the task that logged them"""
+
+    def filter(self, record):
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        if getattr(record, "run_id", None) is None:
+            record.run_id = run_id_var.get()
+        ids = [f"{key}={value}" for key, value in (("request", record.request_id), ("run", record.run_id)) if value]
+        record.context = f" [{' '.join(ids)}]" if ids else ""
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, ids and any `extra` fields"""
+
+    _standard = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "context"}
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self._standard})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+_queue_handler = None
+_listener = None
+_log_files = set()
+
+
+def _add_handler(handler):
+    _listener.handlers = _listener.handlers + (handler,)
+
+
+def setup_logging(level=logging.INFO, log_path=None, json_console=False):
+    """
+    Routes all logging through a queue to a background listener thread. The first call
+    installs the console handler; every call may add a JSON-lines `log_path`.
+    """
+    global _queue_handler, _listener
+    root = logging.getLogger()
+    if _listener is None:
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(JsonFormatter() if json_console else logging.Formatter(TEXT_FORMAT))
+        _listener = logging.handlers.QueueListener(queue.SimpleQueue(), console, respect_handler_level=True)
+        _queue_handler = logging.handlers.QueueHandler(_listener.queue)
+        _queue_handler.addFilter(ContextFilter())
+        # Replace basicConfig-style handlers so nothing is written twice
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+        logging.getLogger("httpx").setLevel(logging.WARNING)  # Otherwise one INFO line per Apify API call
+        _listener.start()
+        atexit.register(_listener.stop)  # Flushes what is still queued
+    root.setLevel(level)
+
+    if log_path and os.path.abspath(log_path) not in _log_files:
+        _log_files.add(os.path.abspath(log_path))
+        if os.path.dirname(log_path):
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        file_handler = logging.FileHandler(log_path, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        _add_handler(file_handler)
+    return root
+
+
+@contextlib.contextmanager
+def log_context(request_id=None, run_id=None):
+    """Tags every record logged inside the block (and in tasks created from it) with these ids"""
+    tokens = []
+    if request_id is not None:
+        tokens.append((request_id_var, request_id_var.set(request_id)))
+    if run_id is not None:
+        tokens.append((run_id_var, run_id_var.set(run_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
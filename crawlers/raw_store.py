@@ -0,0 +1,149 @@
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+MANIFEST_FILENAME = "_manifest.jsonl"
+
+# ----------------- Partitioned raw store -------------------- #
+
+class RawStore:
+    """
+    Parquet store for raw scrape results, partitioned as
+    `<root>/source=<source>/scrape_date=<YYYY-MM-DD>/key=<keyword or channel>/part-<name>-<n>.parquet`.
+    Every part written is appended to `<root>/_manifest.jsonl` with its partition, row count
+    and columns, so readers pick the parts they need from the manifest and only load the
+    columns they ask for, instead of listing and parsing every raw file.
+    Sinks write pages from executor threads, so manifest appends are serialized.
+    """
+
+    def __init__(self, root="Raw_Data/store"):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_FILENAME)
+        self._manifest_lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def partition_dir(self, source, scrape_date, key):
+        return os.path.join(
+            self.root,
+            f"source={source}",
+            f"scrape_date={scrape_date}",
+            f"key={quote(str(key), safe='')}",  # Keywords and channel URLs are not path-safe
+        )
+
+    def clear_parts(self, source, scrape_date, key, name):
+        """Removes the parts an earlier attempt wrote under `name` (e.g. a resumed run)"""
+        pattern = os.path.join(glob.escape(self.partition_dir(source, scrape_date, key)),
+                               f"part-{glob.escape(name)}-*.parquet")
+        for filename in glob.glob(pattern):
+            os.remove(filename)
+
+    def write_page(self, source, scrape_date, key, name, part, items):
+        """Writes one page of items as part `part` of `name` and records it in the manifest"""
+        if not items:
+            return None
+        directory = self.partition_dir(source, scrape_date, key)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{name}-{part}.parquet")
+
+        table = self._to_table(items)
+        pq.write_table(table, path)
+        self._append_manifest({
+            "path": os.path.relpath(path, self.root),
+            "source": source,
+            "scrape_date": scrape_date,
+            "key": str(key),
+            "name": name,
+            "rows": table.num_rows,
+            "columns": table.column_names,
+            "written_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        return path
+
+    @staticmethod
+    def _to_table(items):
+        keys = {}
+        for item in items:
+            keys.update(dict.fromkeys(item))  # Union of keys, in first-seen order
+        return pa.table({key: _column_values([item.get(key) for item in items]) for key in keys})
+
+    def _append_manifest(self, entry):
+        with self._manifest_lock, open(self.manifest_path, 'a', encoding='utf-8') as manifest:
+            manifest.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def entries(self, source=None, since=None, until=None, keys=None):
+        """
+        Manifest entries of the parts matching the filters. `since`/`until` are inclusive
+        `YYYY-MM-DD` scrape dates; `keys` limits the keywords/channels. A part rewritten by a
+        resumed run is listed once.
+        """
+        if not os.path.exists(self.manifest_path):
+            return []
+        keys = {str(key) for key in keys} if keys is not None else None
+
+        selected = {}
+        with open(self.manifest_path, 'r', encoding='utf-8') as manifest:
+            for line in manifest:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if source is not None and entry["source"] != source:
+                    continue
+                if since is not None and entry["scrape_date"] < since:
+                    continue
+                if until is not None and entry["scrape_date"] > until:
+                    continue
+                if keys is not None and entry["key"] not in keys:
+                    continue
+                selected[entry["path"]] = entry
+        return [entry for entry in selected.values() if os.path.exists(os.path.join(self.root, entry["path"]))]
+
+    def part_path(self, entry):
+        return os.path.join(self.root, entry["path"])
+
+    def read_part(self, entry, columns=None):
+        """One part as a DataFrame, loading only `columns` (all when None)"""
+        part_columns = None if columns is None else [c for c in columns if c in entry["columns"]]
+        return pd.read_parquet(self.part_path(entry), columns=part_columns)
+
+    def iter_frames(self, source=None, since=None, until=None, keys=None, columns=None):
+        """Yields (entry, DataFrame) per matching part, loading only `columns` (all when None)"""
+        for entry in self.entries(source, since, until, keys):
+            yield entry, self.read_part(entry, columns)
+
+    def read(self, source=None, since=None, until=None, keys=None, columns=None):
+        """Matching parts concatenated into one DataFrame"""
+        frames = [df for _, df in self.iter_frames(source, since, until, keys, columns)]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def partitions(self, source=None):
+        """Row count per (source, scrape_date, key) partition"""
+        rows = {}
+        for entry in self.entries(source):
+            partition = (entry["source"], entry["scrape_date"], entry["key"])
+            rows[partition] = rows.get(partition, 0) + entry["rows"]
+        return rows
+
+
+def _column_values(values):
+    """
+    Keeps a column as is when its values share one scalar type (ints and floats mix fine);
+    otherwise nested or mixed values are stored as text, the way the CSV files held them.
+    """
+    types = {type(value) for value in values if value is not None}
+    if len(types) <= 1 and types <= {str, int, float, bool} or types == {int, float}:
+        return values
+    return [
+        None if value is None
+        else json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list))
+        else str(value)
+        for value in values
+    ]
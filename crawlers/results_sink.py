@@ -0,0 +1,192 @@
+import csv
+import glob
+import json
+import logging
+import os
+from datetime import datetime
+from urllib.parse import unquote
+
+# ----------------- Raw results sink -------------------- #
+
+class RawResultsSink:
+    """
+    Single-pass, append-only sink for one dataset. Each page is walked once: every
+    item is stamped with `scrappingDate` and appended to `<prefix>_results.jsonl`, and
+    the page is written as a Parquet part of the RawStore's `source`/scrape date/
+    `partition_key` partition, its columns being the keys the page brings. The server
+    always gives the managers a store; files are opened per page, so memory and write
+    time depend on the page size only.
+    Without a store (flat raw directories read by older tools), rows go to CSV parts
+    instead: when an item brings a key the current part lacks, a new part
+    `<prefix>_results_<n>.csv` is started with the wider header (the processors concat
+    parts and align columns), so nothing already on disk is ever rewritten.
+    """
+
+    def __init__(self, filename_prefix, store=None, source=None, partition_key=None):
+        self.filename_prefix = filename_prefix
+        self.jsonl_filename = f"{filename_prefix}_results.jsonl"
+        self.scrapping_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.fieldnames = []
+        self._known_keys = set()
+        self.csv_parts = []
+        self.count = 0
+        self.store = store
+        self.source = source
+        self.partition_key = partition_key
+        self.store_parts = []
+        self.logger = logging.getLogger('apify_client')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _clear_previous(self):
+        """Removes output of an earlier attempt at this dataset (e.g. a resumed run) before appending"""
+        pattern = f"{glob.escape(self.filename_prefix)}_results*"
+        for filename in glob.glob(f"{pattern}.jsonl") + glob.glob(f"{pattern}.csv"):
+            os.remove(filename)
+        if self.store is not None:
+            self.store.clear_parts(self.source, self.scrape_date, self.partition_key, self.part_name)
+
+    @property
+    def scrape_date(self):
+        return self.scrapping_date[:10]
+
+    @property
+    def part_name(self):
+        return os.path.basename(self.filename_prefix)
+
+    def write_page(self, items):
+        """Appends one page of items to the JSONL file and the current CSV part (or the store)"""
+        if not items:
+            return
+        if not self.count:
+            self._clear_previous()
+        if self.store is not None:
+            self._write_store_page(items)
+            return
+
+        csv_file = None
+        try:
+            with open(self.jsonl_filename, 'a', encoding='utf-8') as jsonl_file:
+                if self.csv_parts:
+                    csv_file = open(self.csv_parts[-1], 'a', newline='', encoding='utf-8')
+                    csv_writer = csv.DictWriter(csv_file, fieldnames=self.fieldnames)
+
+                for item in items:
+                    item['scrappingDate'] = self.scrapping_date
+                    jsonl_file.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+                    if csv_file is None or not item.keys() <= self._known_keys:
+                        if csv_file is not None:
+                            csv_file.close()
+                        csv_file = self._start_csv_part(item.keys())
+                        csv_writer = csv.DictWriter(csv_file, fieldnames=self.fieldnames)
+                        csv_writer.writeheader()
+                    csv_writer.writerow(item)
+                    self.count += 1
+        finally:
+            if csv_file is not None:
+                csv_file.close()
+
+    def _write_store_page(self, items):
+        with open(self.jsonl_filename, 'a', encoding='utf-8') as jsonl_file:
+            for item in items:
+                item['scrappingDate'] = self.scrapping_date
+                jsonl_file.write(json.dumps(item, ensure_ascii=False) + '\n')
+        path = self.store.write_page(self.source, self.scrape_date, self.partition_key, self.part_name,
+                                     len(self.store_parts) + 1, items)
+        self.store_parts.append(path)
+        self.count += len(items)
+
+    def _start_csv_part(self, keys):
+        self._known_keys.update(keys)
+        self.fieldnames = sorted(self._known_keys)
+        if self.csv_parts:
+            filename = f"{self.filename_prefix}_results_{len(self.csv_parts) + 1}.csv"
+        else:
+            filename = f"{self.filename_prefix}_results.csv"
+        self.csv_parts.append(filename)
+        return open(filename, 'w', newline='', encoding='utf-8')
+
+    def close(self):
+        if not self.count:
+            self.logger.warning(f"No items to save for {self.filename_prefix}")
+            return
+        if self.store is not None:
+            self.logger.info(f"{self.count} results saved to {self.jsonl_filename} and "
+                             f"{len(self.store_parts)} Parquet parts in {self.store.root}")
+            return
+        self.logger.info(f"{self.count} results saved to {self.jsonl_filename} and {', '.join(self.csv_parts)}")
+
+
+class SplitResultsSink:
+    """
+    Splits the dataset of a batched run back per input. Items are routed on their
+    `inputUrl` to one RawResultsSink per input (`<prefix>_<n>_results.*`); items that
+    match no input go to `<prefix>_results.*`. A single-input run keeps the plain
+    `<prefix>_results.*` naming. With a RawStore, each input is its own partition, keyed
+    by `partition_keys` (the keywords/URLs the links were built from) or the link.
+    An `observer(partition_key, items)` sees every routed group (key None when unmatched).
+    """
+
+    def __init__(self, filename_prefix, input_links, key='inputUrl', store=None, source=None, partition_keys=None,
+                 observer=None):
+        self.filename_prefix = filename_prefix
+        self.input_links = input_links
+        self.key = key
+        self.store = store
+        self.source = source
+        self.partition_keys = partition_keys or input_links
+        self.observer = observer
+        self._index = {self._normalize(link): i for i, link in enumerate(input_links)}
+        self._sinks = {}  # Created lazily so inputs without results don't leave empty files
+
+    @staticmethod
+    def _normalize(link):
+        return unquote(str(link)).strip().rstrip('/')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def counts(self):
+        """Number of items written per input link"""
+        counts = {link: 0 for link in self.input_links}
+        for i, sink in self._sinks.items():
+            if i is not None:
+                counts[self.input_links[i]] = sink.count
+        return counts
+
+    def write_page(self, items):
+        groups = {}
+        for item in items:
+            if len(self.input_links) == 1:
+                i = 0
+            else:
+                i = self._index.get(self._normalize(item.get(self.key, '')))
+            groups.setdefault(i, []).append(item)
+        for i, group in groups.items():
+            self._sink(i).write_page(group)
+            if self.observer is not None:
+                self.observer(None if i is None else self.partition_keys[i], group)
+
+    def _sink(self, i):
+        if i not in self._sinks:
+            partition_key = "_unmatched" if i is None else self.partition_keys[i]
+            if i is None or len(self.input_links) == 1:
+                filename_prefix = self.filename_prefix
+            else:
+                filename_prefix = f"{self.filename_prefix}_{i}"
+            self._sinks[i] = RawResultsSink(filename_prefix, store=self.store, source=self.source,
+                                            partition_key=partition_key)
+        return self._sinks[i]
+
+    def close(self):
+        for sink in self._sinks.values():
+            sink.close()
@@ -0,0 +1,169 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict
+from crawlers.log_setup import log_context
+
+# ----------------- Run completion events -------------------- #
+
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+
+WEBHOOK_EVENT_TYPES = [
+    "ACTOR.RUN.SUCCEEDED",
+    "ACTOR.RUN.FAILED",
+    "ACTOR.RUN.ABORTED",
+    "ACTOR.RUN.TIMED_OUT",
+]
+
+
+def build_run_webhooks(request_url):
+    """Builds the ad-hoc webhook list attached to an actor run so Apify calls us back on completion"""
+    if not request_url:
+        return None
+    return [{"event_types": WEBHOOK_EVENT_TYPES, "request_url": request_url}]
+
+
+def failed_run_info(run_id, message):
+    """Stand-in run info for a run whose real info could not be fetched; it has no dataset and no stats"""
+    return {"id": run_id, "status": "FAILED", "statusMessage": message, "defaultDatasetId": None}
+
+
+class _PendingRun:
+    def __init__(self, run_id, future, fetch_run, interval):
+        self.run_id = run_id
+        self.future = future
+        self.fetch_run = fetch_run
+        self.interval = interval
+        self.failed_polls = 0  # Consecutive polls that raised or found no run
+        self.next_poll = time.monotonic() + interval
+
+
+class RunCompletionHub:
+    """
+    Resolves one future per Apify run when the run reaches a terminal status.
+    Webhook notifications are the fast path; a single shared poller with
+    adaptive backoff checks every pending run as a fallback. A run the poller fails
+    to fetch `max_failed_polls` times in a row is resolved as FAILED, so its waiter
+    does not hang on a run that was deleted or an API that keeps erroring.
+    """
+
+    def __init__(self, min_interval=2, max_interval=60, backoff_factor=1.5, max_early_events=1000, max_failed_polls=10):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.max_early_events = max_early_events
+        self.max_failed_polls = max_failed_polls
+        self.logger = logging.getLogger(__name__)
+        self._pending = {}
+        self._early_events = OrderedDict()  # Webhooks that arrived before anyone waited on the run
+        self._wakeup = None
+        self._poller_task = None
+
+    @property
+    def pending_runs(self):
+        return list(self._pending)
+
+    def notify(self, run_id, run_info=None):
+        """Handles a completion notification (usually a webhook) for a run. Returns True if a waiter was resolved"""
+        run_info = run_info or {}
+        pending = self._pending.get(run_id)
+
+        if run_info.get("status") not in TERMINAL_STATUSES:
+            # Payload without a usable status: make the poller check this run right away
+            if pending:
+                pending.next_poll = time.monotonic()
+                self._wake_poller()
+            return False
+
+        if pending is None:
+            self._early_events[run_id] = run_info
+            while len(self._early_events) > self.max_early_events:
+                self._early_events.popitem(last=False)
+            return False
+
+        self._resolve(pending, run_info)
+        return True
+
+    async def wait_for_run(self, run_id, fetch_run, initial_interval=None, timeout=None):
+        """
+        Waits until the run reaches a terminal status and returns its run info.
+        `fetch_run` is a coroutine function `run_id -> run info dict` used by the fallback poller.
+        """
+        if run_id in self._early_events:
+            return self._early_events.pop(run_id)
+
+        pending = self._pending.get(run_id)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            interval = initial_interval if initial_interval is not None else self.min_interval
+            pending = _PendingRun(run_id, loop.create_future(), fetch_run, interval)
+            self._pending[run_id] = pending
+            self._ensure_poller()
+            self._wake_poller()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending.future), timeout=timeout)
+        finally:
+            # Resolved, timed out or cancelled: either way nobody is waiting on this run any more
+            if self._pending.get(run_id) is pending:
+                del self._pending[run_id]
+
+    def _resolve(self, pending, run_info):
+        self._pending.pop(pending.run_id, None)
+        if not pending.future.done():
+            pending.future.set_result(run_info)
+
+    def _ensure_poller(self):
+        if self._poller_task is None or self._poller_task.done():
+            self._wakeup = asyncio.Event()
+            # Shared by every run: a fresh context, not the one of the waiter that happened to start it
+            self._poller_task = asyncio.create_task(self._poll_loop(), context=contextvars.Context())
+
+    def _wake_poller(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _poll_loop(self):
+        while self._pending:
+            now = time.monotonic()
+            due = [pending for pending in self._pending.values() if pending.next_poll <= now]
+            if due:
+                await asyncio.gather(*(self._poll_run(pending) for pending in due))
+                continue
+
+            next_poll = min(pending.next_poll for pending in self._pending.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0, next_poll - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll_run(self, pending):
+        with log_context(run_id=pending.run_id):
+            try:
+                run_info = await pending.fetch_run(pending.run_id)
+            except Exception as e:
+                self.logger.warning(f"Polling run {pending.run_id} failed: {e}")
+                run_info = None
+
+            if not run_info:
+                pending.failed_polls += 1
+                if pending.failed_polls >= self.max_failed_polls:
+                    self.logger.error(f"Run {pending.run_id} could not be fetched in {pending.failed_polls} polls, "
+                                      f"giving up on it as FAILED")
+                    self._resolve(pending, failed_run_info(pending.run_id, "Run could not be fetched"))
+                    return
+            else:
+                pending.failed_polls = 0
+
+        if run_info and run_info.get("status") in TERMINAL_STATUSES:
+            self._resolve(pending, run_info)
+            return
+
+        pending.interval = min(pending.interval * self.backoff_factor, self.max_interval)
+        pending.next_poll = time.monotonic() + pending.interval
+
+
+# Process-wide hub shared by the scrapers and the webhook route in server.py
+run_hub = RunCompletionHub()
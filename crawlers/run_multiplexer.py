@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from crawlers.concurrency import AIMDController
+from crawlers.log_setup import run_id_var
+
+# ----------------- Run multiplexer -------------------- #
+
+class RunMultiplexer:
+    """
+    Tracks every in-flight actor run of a manager. Workers only start runs and
+    hand the run id over; waiting for completion, fetching and saving happen in
+    one task per run here. Concurrent actor runs are limited by an AIMD controller
+    capped at `max_in_flight`, independently of the number of workers.
+    Handlers return True when the run succeeded, which feeds the controller.
+    `release_run(run_id)` is awaited once a run leaves the multiplexer however it ends
+    (finished, failed, cancelled or aborted), so a run never keeps its process-wide
+    quota slot; it must be safe to call for a run that was already released.
+    """
+
+    def __init__(self, max_in_flight=10, controller=None, release_run=None):
+        self.max_in_flight = max_in_flight
+        self.controller = controller or AIMDController(max_limit=max_in_flight)
+        self.release_run = release_run
+        self.logger = logging.getLogger(__name__)
+        self._in_flight = {}  # run_id -> task finishing that run
+        self._run_args = {}  # run_id -> handler args, to finish the run differently on abort
+        self._handed_over = set()  # Runs whose abort handler now owns the release
+
+    @property
+    def in_flight(self):
+        return list(self._in_flight)
+
+    async def acquire_slot(self):
+        """Waits until another run may be started. Call before starting the run"""
+        await self.controller.acquire()
+
+    async def release_slot(self, error=None):
+        """Gives a slot back when starting the run failed; rate-limit errors make the controller back off"""
+        await self.controller.release()
+        if getattr(error, "status_code", None) == 429:
+            await self.controller.record_failure("HTTP 429")
+
+    def track(self, run_id, handler, *args):
+        """Finishes the run in the background with `handler(run_id, *args)`, then frees its slot"""
+        task = asyncio.create_task(self._finish(run_id, handler(run_id, *args)))
+        self._in_flight[run_id] = task
+        self._run_args[run_id] = args
+        return task
+
+    async def _finish(self, run_id, handler_coro):
+        run_id_var.set(run_id)  # Tags the run's log records; each task has its own context
+        start_time = time.monotonic()
+        succeeded = False
+        try:
+            succeeded = await handler_coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Finishing run {run_id} failed: {e}")
+        finally:
+            self._in_flight.pop(run_id, None)
+            self._run_args.pop(run_id, None)
+            await self.controller.release()
+            if run_id not in self._handed_over:
+                await self._release_run(run_id)
+
+        if succeeded:
+            await self.controller.record_success(time.monotonic() - start_time)
+        else:
+            await self.controller.record_failure(f"run {run_id} did not succeed")
+
+    async def join(self):
+        """Waits for every tracked run, including runs tracked while waiting"""
+        while self._in_flight:
+            # asyncio.wait, unlike gather, leaves the runs alone when the join itself is cancelled (deadline)
+            await asyncio.wait(list(self._in_flight.values()))
+
+    def cancel_all(self):
+        """Cancels every run's task; each one releases its run as it unwinds"""
+        for task in self._in_flight.values():
+            task.cancel()
+
+    async def _release_run(self, run_id):
+        if self.release_run is None:
+            return
+        try:
+            await self.release_run(run_id)
+        except Exception as e:
+            self.logger.error(f"Releasing run {run_id} failed: {e}")
+
+    async def _abort(self, abort_handler, run_id, args):
+        try:
+            return await abort_handler(run_id, *args)
+        finally:  # Also when the flush times out and cancels the handler
+            self._handed_over.discard(run_id)
+            await self._release_run(run_id)
+
+    async def abort_all(self, abort_handler, timeout=None):
+        """
+        Stops waiting on every in-flight run and finishes each one with `abort_handler(run_id, *args)`
+        instead (abort it, flush its partial dataset). Returns the run ids that were handed over.
+        """
+        runs = {run_id: self._run_args.get(run_id, ()) for run_id in self._in_flight}
+        tasks = list(self._in_flight.values())
+        self._handed_over.update(runs)
+        self.cancel_all()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.gather(*(self._abort(abort_handler, run_id, args) for run_id, args in runs.items()),
+                                 return_exceptions=True)
+        try:
+            outcomes = await asyncio.wait_for(results, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.logger.error(f"Flushing {len(runs)} aborted runs did not finish in {timeout}s")
+            return list(runs)
+        for run_id, outcome in zip(runs, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Aborting run {run_id} failed: {outcome}")
+        return list(runs)
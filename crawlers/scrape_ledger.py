@@ -0,0 +1,130 @@
+from datetime import datetime
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+Base = declarative_base()
+
+# Ledger statuses
+RUNNING = "RUNNING"
+SUCCEEDED = "SUCCEEDED"
+FAILED = "FAILED"
+ABORTED = "ABORTED"  # Cut at the deadline; its partial results are saved but the input is scraped again
+
+# ----------------- Scrape ledger -------------------- #
+
+class LedgerEntry(Base):
+    __tablename__ = "scrape_ledger"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String, nullable=False)  # "linkedin" or "telegram"
+    sweep_id = Column(String, nullable=False)  # Groups the inputs of one logical sweep (e.g. keywords/day/date)
+    input_value = Column(String, nullable=False)  # Keyword, URL or channel range
+    run_id = Column(String, nullable=True, index=True)
+    dataset_id = Column(String, nullable=True)
+    status = Column(String, nullable=False, default=RUNNING)
+    item_count = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        UniqueConstraint("source", "sweep_id", "input_value", name="uq_ledger_input"),
+    )
+
+
+class ChannelMark(Base):
+    __tablename__ = "channel_marks"
+
+    channel = Column(String, primary_key=True)
+    last_post_id = Column(Integer, nullable=False)  # Every post up to this id has been scraped
+    updated_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+
+class ScrapeLedger:
+    """
+    Durable record of which inputs were scraped, by which run, and with what result.
+    Managers skip inputs that already succeeded and resume runs left RUNNING by a
+    timeout or restart. Calls are blocking SQLite I/O: managers make them through
+    asyncio.to_thread, off the event loop.
+    """
+
+    def __init__(self, db_path="scrape_ledger.db"):
+        self.engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def completed_inputs(self, source, sweep_id, inputs):
+        """Those of `inputs` whose results are already saved in the sweep, without loading the rest of it"""
+        inputs = list(inputs)
+        completed = set()
+        with self.Session() as session:
+            for i in range(0, len(inputs), 500):  # Stay under SQLite's bound-parameter limit
+                rows = session.query(LedgerEntry.input_value).filter(
+                    LedgerEntry.source == source,
+                    LedgerEntry.sweep_id == sweep_id,
+                    LedgerEntry.status == SUCCEEDED,
+                    LedgerEntry.input_value.in_(inputs[i:i + 500]),
+                )
+                completed.update(row.input_value for row in rows)
+        return completed
+
+    def in_flight_runs(self, source, sweep_id):
+        """Runs started but never finished, as {run_id: [inputs]}"""
+        runs = {}
+        with self.Session() as session:
+            rows = session.query(LedgerEntry).filter_by(source=source, sweep_id=sweep_id, status=RUNNING)
+            for entry in rows.order_by(LedgerEntry.id):
+                if entry.run_id:
+                    runs.setdefault(entry.run_id, []).append(entry.input_value)
+        return runs
+
+    def mark_started(self, source, sweep_id, inputs, run_id):
+        now = datetime.now()
+        self._upsert(source, sweep_id, inputs, run_id=run_id, dataset_id=None, status=RUNNING,
+                     item_count=0, started_at=now, finished_at=None)
+
+    def mark_finished(self, source, sweep_id, inputs, status, dataset_id=None, item_counts=None):
+        """Records the final status; `item_counts` maps each input to the number of items saved for it"""
+        item_counts = item_counts or {}
+        with self.Session() as session, session.begin():
+            for entry in self._entries(session, source, sweep_id, inputs):
+                entry.status = status
+                entry.dataset_id = dataset_id
+                entry.item_count = item_counts.get(entry.input_value, 0)
+                entry.finished_at = datetime.now()
+
+    def get_high_water_mark(self, channel):
+        """Last post id scraped for the Telegram channel, or None if it was never scraped incrementally"""
+        with self.Session() as session:
+            mark = session.get(ChannelMark, channel)
+            return mark.last_post_id if mark else None
+
+    def set_high_water_mark(self, channel, last_post_id):
+        """Moves the channel's mark forward; it never goes back"""
+        with self.Session() as session, session.begin():
+            mark = session.get(ChannelMark, channel)
+            if mark is None:
+                session.add(ChannelMark(channel=channel, last_post_id=last_post_id))
+            elif last_post_id > mark.last_post_id:
+                mark.last_post_id = last_post_id
+
+    def _entries(self, session, source, sweep_id, inputs):
+        entries = {
+            entry.input_value: entry
+            for entry in session.query(LedgerEntry).filter(
+                LedgerEntry.source == source,
+                LedgerEntry.sweep_id == sweep_id,
+                LedgerEntry.input_value.in_(inputs),
+            )
+        }
+        for input_value in inputs:
+            if input_value not in entries:
+                entries[input_value] = LedgerEntry(source=source, sweep_id=sweep_id, input_value=input_value)
+                session.add(entries[input_value])
+        return entries.values()
+
+    def _upsert(self, source, sweep_id, inputs, **fields):
+        with self.Session() as session, session.begin():
+            for entry in self._entries(session, source, sweep_id, inputs):
+                for name, value in fields.items():
+                    setattr(entry, name, value)
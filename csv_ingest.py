@@ -0,0 +1,171 @@
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# ------------- Parallel CSV ingestion ----------------- #
+#
+# Reads many CSV files at once with pyarrow's CSV reader (which releases the GIL, so a
+# thread pool scales with cores), applies a declared schema, concatenates the Arrow
+# tables without copying and converts to pandas once. Used by the CSV processors, the
+# users/orders manager and the dashboard.
+
+PARSE_OPTIONS = pacsv.ParseOptions(newlines_in_values=True)  # Post texts span lines
+TEMPORAL_TYPES = (pa.types.is_timestamp, pa.types.is_date, pa.types.is_time)
+CATEGORY = pa.dictionary(pa.int32(), pa.string())  # The "category" alias: a pandas categorical
+
+
+def arrow_type(alias: str) -> pa.DataType:
+    return CATEGORY if alias == "category" else pa.type_for_alias(alias)
+
+
+def _pandas_options(schema: dict, include: list) -> tuple[dict, list]:
+    """The part of `schema` pd.read_csv can apply: text and categorical dtypes, dates to parse"""
+    dtypes, dates = {}, []
+    for column, alias in (schema or {}).items():
+        if column not in include:
+            continue
+        if alias in ("string", "category"):
+            dtypes[column] = str if alias == "string" else "category"
+        elif alias.startswith(("timestamp", "date")):
+            dates.append(column)
+    return dtypes, dates
+
+
+def read_header(path: str) -> list:
+    """Column names of a CSV file, without reading past its first line"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def _read_table(path: str, schema: dict, columns, parse_dates: bool, use_threads: bool):
+    """One file as an Arrow table; a pandas DataFrame when pyarrow cannot type it"""
+    header = read_header(path)
+    if not header:
+        return None
+    include = [column for column in header if columns is None or column in columns]
+    column_types = {column: arrow_type(alias) for column, alias in (schema or {}).items() if column in include}
+    declared = set(column_types)
+    for _ in range(2):
+        convert_options = pacsv.ConvertOptions(column_types=column_types, include_columns=include,
+                                               strings_can_be_null=True)
+        try:
+            table = pacsv.read_csv(path, read_options=pacsv.ReadOptions(use_threads=use_threads),
+                                   parse_options=PARSE_OPTIONS, convert_options=convert_options)
+        except pa.ArrowInvalid:
+            # pyarrow types columns from the first block; a later value that doesn't fit needs pandas
+            dtypes, dates = _pandas_options(schema, include)
+            return pd.read_csv(path, usecols=include, dtype=dtypes, parse_dates=dates)
+        temporal = [field.name for field in table.schema
+                    if field.name not in declared and any(check(field.type) for check in TEMPORAL_TYPES)]
+        if parse_dates or not temporal:
+            return table
+        # Like pd.read_csv, keep undeclared dates as the text they were written as
+        column_types.update({column: pa.string() for column in temporal})
+    return table
+
+
+def _concat_tables(tables: list) -> pa.Table:
+    """Concatenates without copying; columns missing from a file are null, conflicting types become text"""
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        types = {}
+        for table in tables:
+            for field in table.schema:
+                types.setdefault(field.name, set()).add(field.type)
+        conflicting = {name for name, found in types.items() if len(found - {pa.null()}) > 1}
+        tables = [
+            table.cast(pa.schema([pa.field(f.name, pa.string() if f.name in conflicting else f.type)
+                                  for f in table.schema]))
+            for table in tables
+        ]
+        return pa.concat_tables(tables, promote_options="permissive")
+
+
+def concat_frames(frames: list) -> pd.DataFrame:
+    """pd.concat that keeps categorical columns categorical when the frames' categories differ"""
+    if len(frames) == 1:
+        return frames[0]
+    categorical = {column for frame in frames for column, dtype in frame.dtypes.items()
+                   if isinstance(dtype, pd.CategoricalDtype)}
+    for column in categorical:
+        present = [frame[column].astype("category") for frame in frames if column in frame.columns]
+        dtype = pd.CategoricalDtype(present[0].cat.categories.append([s.cat.categories for s in present[1:]]).unique())
+        frames = [frame.astype({column: dtype}) if column in frame.columns else frame for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_csvs(paths: list, schema: dict = None, columns=None, source_column: str = None, parse_dates: bool = False,
+              workers: int = None, on_read=None) -> pd.DataFrame:
+    """
+    Reads `paths` concurrently into one DataFrame, in the order given (files only pandas
+    can type come last). `schema` maps columns to Arrow type aliases ("string", "int32",
+    "timestamp[ns]", ..., or "category"); other columns are inferred. `columns` limits the
+    columns read. `source_column` adds each file's name (without .csv) as a categorical
+    column. Undeclared date columns stay text unless `parse_dates`. `on_read(path, rows)`
+    is called for every file read.
+    """
+    if not paths:
+        return pd.DataFrame()
+    workers = workers or os.cpu_count() or 1
+    use_threads = len(paths) < workers  # Few big files: let pyarrow split each one instead
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda path: _read_table(path, schema, columns, parse_dates, use_threads), paths))
+
+    tables, frames = [], []
+    for path, result in zip(paths, results):
+        if result is None:
+            continue
+        rows = result.num_rows if isinstance(result, pa.Table) else len(result)
+        if source_column:
+            name = os.path.basename(path).replace('.csv', '')
+            if isinstance(result, pa.Table):
+                indices = pa.array(np.zeros(rows, dtype=np.int32))
+                result = result.append_column(source_column, pa.DictionaryArray.from_arrays(indices, [name]))
+            else:
+                result[source_column] = pd.Series(name, index=result.index, dtype="category")
+        if isinstance(result, pa.Table):
+            tables.append(result)
+        else:
+            frames.append(result)
+        if on_read is not None:
+            on_read(path, rows)
+
+    if tables:
+        frames.insert(0, _concat_tables(tables).to_pandas(split_blocks=True, self_destruct=True))
+    if not frames:
+        return pd.DataFrame()
+    return concat_frames(frames)
+
+
+def iter_csv_chunks(paths: list, chunk_rows: int, schema: dict = None, columns=None, source_column: str = None,
+                    parse_dates: bool = False, workers: int = None, on_read=None):
+    """
+    Like `read_csvs`, but yields DataFrames of about `chunk_rows` rows, reading `workers`
+    files at a time, so only about one chunk is in memory. Files are never split.
+    """
+    workers = workers or os.cpu_count() or 1
+    buffered, rows = [], 0
+    for start in range(0, len(paths), workers):
+        df = read_csvs(paths[start:start + workers], schema, columns, source_column, parse_dates, workers, on_read)
+        if df.empty:
+            continue
+        buffered.append(df)
+        rows += len(df)
+        if rows >= chunk_rows:
+            yield concat_frames(buffered)
+            buffered, rows = [], 0
+    if buffered:
+        yield concat_frames(buffered)
+
+
+def load_and_concat_csvs(directory_path: str, schema: dict = None, columns=None, source_column: str = None,
+                         parse_dates: bool = False, workers: int = None, on_read=None) -> pd.DataFrame:
+    """Every CSV file in `directory_path` concatenated into one DataFrame (empty when there are none)"""
+    paths = [os.path.join(directory_path, f) for f in os.listdir(directory_path) if f.endswith('.csv')]
+    return read_csvs(paths, schema, columns, source_column, parse_dates, workers, on_read)
@@ -1,67 +1,280 @@
 import pandas as pd
+import numpy as np
+import hashlib
+import json
 import os
 import re
 from datetime import datetime
+from csv_ingest import read_csvs, read_header, iter_csv_chunks, concat_frames
+from schemas import LINKEDIN_RAW_SCHEMA, TELEGRAM_RAW_SCHEMA
+
+EMAIL_REGEX = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+URL_REGEX = r'(https?://[^\s]+)'
+
+
+def extract_column(texts: pd.Series, pattern: str, marker: str = None) -> tuple[pd.Series, pd.Series]:
+    """
+    Vectorized counterpart of `extract_emails`/`extract_links` for a whole column: one
+    `str.findall` pass, returning the matches as `str(list)` text and their count.
+    `marker` is a literal every match contains ('@' for emails); the regex then only runs
+    on the rows holding it, found with a plain substring search. Non-string cells count as empty text.
+    """
+    try:
+        candidates = texts.str.contains(marker, regex=False, na=False) if marker else texts.notna()
+        matches = texts[candidates].str.findall(pattern).reindex(texts.index)
+    except AttributeError:  # Not a single string in the column
+        matches = pd.Series(float('nan'), index=texts.index, dtype=object)
+    matches = matches.where(matches.notna(), pd.Series([[]] * len(matches), index=matches.index, dtype=object))
+    counts = matches.str.len().astype('int32')
+    # "['a', 'b']" by joining; repr() picks other quotes/escapes for matches holding ' or \
+    joined = matches.str.join("', '")
+    text = ("['" + joined + "']").where(counts > 0, "[]")
+    needs_repr = joined.str.contains("['\\\\]", regex=True)
+    if needs_repr.any():
+        text[needs_repr] = matches[needs_repr].map(str)
+    return text, counts
+
+
+# ------------- Row dedup ----------------- #
+class RowHashSet:
+    """64-bit row hashes in a sorted array: 8 bytes per row instead of the rows themselves"""
+
+    def __init__(self, hashes: np.ndarray = None):
+        self.hashes = np.unique(hashes) if hashes is not None else np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def add_new(self, hashes: np.ndarray) -> np.ndarray:
+        """Mask of the hashes not seen before (first occurrence only); they are added"""
+        positions = np.searchsorted(self.hashes, hashes)
+        seen = positions < len(self.hashes)
+        seen[seen] = self.hashes[positions[seen]] == hashes[seen]
+        new = ~seen & ~pd.Series(hashes).duplicated().to_numpy()
+        self.hashes = np.union1d(self.hashes, hashes[new])
+        return new
+
+
+# ------------- Processed files manifest ----------------- #
+MANIFEST_FILENAME = ".ingest_manifest.json"
+ROWS_FILENAME = ".ingest_rows.npy"
+
+
+class ProcessedManifest:
+    """
+    Raw files already ingested into a processed directory, keyed by path with size, mtime
+    and a SHA-256 of the content, plus a hash per row of the directory's output CSVs so
+    re-ingested rows are not written twice, and the row count of each output. The hash is
+    only recomputed when size or mtime changed, so a touched but unchanged file is not
+    processed again. Kept in `.ingest_manifest.json` and `.ingest_rows.npy` in the
+    directory, whatever the output of each run is named.
+    """
+
+    def __init__(self, save_dir: str):
+        self.save_dir = save_dir
+        self.path = os.path.join(save_dir, MANIFEST_FILENAME)
+        self.rows_path = os.path.join(save_dir, ROWS_FILENAME)
+        self.files = {}
+        self.outputs = {}  # Output CSV name -> rows written to it
+        self.seen_rows = RowHashSet()
+        self._pending = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            self.files = saved.get("files", {})
+            self.outputs = saved.get("outputs", {})
+            if os.path.exists(self.rows_path):
+                self.seen_rows = RowHashSet(np.load(self.rows_path))
+
+    def reset(self):
+        self.files, self.outputs, self._pending = {}, {}, {}
+        self.seen_rows = RowHashSet()
+
+    def is_stale(self) -> bool:
+        """True when never saved or an output it counts was deleted, so its row hashes don't match the directory"""
+        return not os.path.exists(self.path) or any(
+            not os.path.exists(os.path.join(self.save_dir, name)) for name in self.outputs)
+
+    def remove(self):
+        """Deletes the saved manifest, for outputs rewritten from scratch"""
+        for path in (self.path, self.rows_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def is_processed(self, file_path: str) -> bool:
+        """True if the file was ingested before with the same content"""
+        stat = os.stat(file_path)
+        entry = self.files.get(file_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return True
+        sha256 = self.file_hash(file_path)
+        if entry and entry["sha256"] == sha256:
+            entry["size"], entry["mtime"] = stat.st_size, stat.st_mtime  # Touched, not changed
+            return True
+        self._pending[file_path] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256}
+        return False
+
+    def record(self, file_path: str, rows: int):
+        """Marks a file returned by `is_processed` as ingested; kept once `save` is called"""
+        self.files[file_path] = {**self._pending.pop(file_path), "rows": rows,
+                                 "processed_at": datetime.now().isoformat(timespec="seconds")}
+
+    def new_rows(self, hashes: np.ndarray) -> np.ndarray:
+        """Mask of the rows whose hash is not in the output yet; their hashes are added"""
+        return self.seen_rows.add_new(hashes)
+
+    def save(self):
+        np.save(self.rows_path, self.seen_rows.hashes)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"files": self.files, "outputs": self.outputs}, f, indent=2)
+        os.replace(tmp_path, self.path)  # Never leaves a half-written manifest behind
+
 
 # ------------- CSV Processor base ----------------- #
 class CSVProcessorBase:
-    def __init__(self, directory_path: str, save_dir: str):
+    source = None  # Source partition read from the raw store
+    raw_columns = None  # Raw columns the processor needs, passed as `columns` by the server; None = all
+    schema = {}  # Declared raw CSV column types (csv_ingest aliases, see schemas.py); the rest is inferred
+
+    def __init__(self, directory_path: str, save_dir: str, raw_store=None, since: str = None,
+                 until: str = None, keys: list = None, columns: list = None, incremental: bool = False,
+                 chunk_rows: int = None, near_duplicates=None, drop_near_duplicates: bool = False):
         """
         Initialize the processor with the directory path where CSV files are stored and save directory.
+        With a raw store, its Parquet partitions for this source are read too: only scrape dates in
+        `since`..`until` (YYYY-MM-DD), only `keys` (keywords/channels) and only `columns`, when given.
+        In `incremental` mode only raw files missing from the save directory's manifest are processed,
+        and only rows no output in the directory holds yet are written (appended when the output
+        exists). With `chunk_rows` the raw data is processed
+        and written about that many rows at a time instead of all at once. With a `near_duplicates`
+        index (near_duplicates.NearDuplicateIndex), posts repeating an earlier one of either source
+        are tagged in a `duplicateOf` column, or dropped when `drop_near_duplicates`.
         """
         self.directory_path = directory_path
         self.save_dir = save_dir
+        self.raw_store = raw_store
+        self.since = since
+        self.until = until
+        self.keys = keys
+        self.columns = columns
+        self.incremental = incremental
+        self.chunk_rows = chunk_rows
+        self.near_duplicates = near_duplicates
+        self.drop_near_duplicates = drop_near_duplicates
         self.df = None
         self.accounts = None
 
-    def merge_csv_files(self) -> pd.DataFrame:
+    def merge_csv_files(self, manifest: ProcessedManifest = None) -> pd.DataFrame:
         """
-        Merges all CSV files in the directory into a single DataFrame with an added source file column.
+        Merges all CSV files in the directory (and the raw store partitions) into a single DataFrame
+        with an added source file column. With a manifest, files it already holds are skipped.
         """
-        dataframes = []
-        for filename in os.listdir(self.directory_path):
-            if filename.endswith('.csv'):
-                file_path = os.path.join(self.directory_path, filename)
-                df = pd.read_csv(file_path)
-                df['source_file'] = filename.replace('.csv', '')
+        csv_paths = self._raw_csv_paths()
+        if manifest is not None:
+            csv_paths = [file_path for file_path in csv_paths if not manifest.is_processed(file_path)]
+        df = read_csvs(csv_paths, schema=self.schema, columns=self.columns, source_column='source_file',
+                       on_read=manifest.record if manifest is not None else None)
+        dataframes = [df] if csv_paths else []
+
+        if self.raw_store is not None:
+            for entry in self.raw_store.entries(self.source, self.since, self.until, self.keys):
+                part_path = self.raw_store.part_path(entry)
+                if manifest is not None and manifest.is_processed(part_path):
+                    continue
+                df = self.raw_store.read_part(entry, self.columns)
+                df['source_file'] = pd.Series(f"{entry['name']}_results", index=df.index, dtype="category")
                 dataframes.append(df)
+                if manifest is not None:
+                    manifest.record(part_path, len(df))
         
         if dataframes:
-            self.df = pd.concat(dataframes, ignore_index=True)
+            self.df = concat_frames(dataframes)
+        elif manifest is not None:
+            self.df = pd.DataFrame()
         else:
             print("No CSV files found in the directory. ⚠️")
             self.df = pd.DataFrame()
         return self.df
 
+    def _raw_csv_paths(self) -> list:
+        return [
+            os.path.join(self.directory_path, filename) for filename in os.listdir(self.directory_path)
+            if filename.endswith('.csv')
+        ]
+
+    def iter_raw_chunks(self, manifest: ProcessedManifest):
+        """
+        Raw rows not in the manifest yet, in chunks of about `chunk_rows` rows. Every chunk has
+        the same columns, in the order a full merge would give them, so their outputs line up.
+        """
+        csv_paths = [file_path for file_path in self._raw_csv_paths() if not manifest.is_processed(file_path)]
+        entries = []
+        if self.raw_store is not None:
+            entries = [entry for entry in self.raw_store.entries(self.source, self.since, self.until, self.keys)
+                       if not manifest.is_processed(self.raw_store.part_path(entry))]
+
+        columns = {}
+        for file_columns in [read_header(file_path) for file_path in csv_paths] + [e["columns"] for e in entries]:
+            for column in file_columns:
+                if not self.columns or column in self.columns:
+                    columns.setdefault(column)
+            columns.setdefault('source_file')
+        columns = list(columns)
+
+        for chunk in iter_csv_chunks(csv_paths, self.chunk_rows, schema=self.schema, columns=self.columns,
+                                     source_column='source_file', on_read=manifest.record):
+            yield chunk.reindex(columns=columns)
+
+        buffered, rows = [], 0
+        for i, entry in enumerate(entries):
+            df = self.raw_store.read_part(entry, self.columns)
+            df['source_file'] = pd.Series(f"{entry['name']}_results", index=df.index, dtype="category")
+            manifest.record(self.raw_store.part_path(entry), len(df))
+            buffered.append(df)
+            rows += len(df)
+            if rows >= self.chunk_rows or i == len(entries) - 1:
+                yield concat_frames(buffered).reindex(columns=columns)
+                buffered, rows = [], 0
+
     def fill_missing_values(self, value: str = "-"):
         if self.df is not None:
-            self.df.fillna(value, inplace=True)
+            # Column by column, so a numeric column with gaps becomes object instead of being filled in place
+            for column in self.df.columns[self.df.isna().any()]:
+                # A categorical only takes values among its categories
+                if isinstance(self.df[column].dtype, pd.CategoricalDtype) and value not in self.df[column].cat.categories:
+                    self.df[column] = self.df[column].cat.add_categories([value])
+                self.df[column] = self.df[column].fillna(value)
         else:
             print("DataFrame is empty. No missing values to fill.")
 
     def extract_emails(self, text: str) -> tuple[str, int]:
-        email_regex = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
         text = text if isinstance(text, str) else ''
-        emails = re.findall(email_regex, text)
+        emails = re.findall(EMAIL_REGEX, text)
         return str(emails), len(emails)
 
     def extract_links(self, text: str) -> tuple[str, int]:
-        url_regex = r'(https?://[^\s]+)'
         text = text if isinstance(text, str) else ''
-        links = re.findall(url_regex, text)
+        links = re.findall(URL_REGEX, text)
         return str(links), len(links)
 
     def process_emails_column(self):
         if self.df is not None and 'text' in self.df.columns:
-            self.df[['emails', 'email_count']] = self.df['text'].apply(
-                lambda x: pd.Series(self.extract_emails(x)))
+            self.df['emails'], self.df['email_count'] = extract_column(self.df['text'], EMAIL_REGEX, '@')
         else:
             print("No 'text' column found in the DataFrame. ⚠️")
 
     def process_links_column(self):
         if self.df is not None and 'text' in self.df.columns:
-            self.df[['links', 'link_count']] = self.df['text'].apply(
-                lambda x: pd.Series(self.extract_links(x)))
+            self.df['links'], self.df['link_count'] = extract_column(self.df['text'], URL_REGEX, 'http')
         else:
             print("No 'text' column found in the DataFrame. ⚠️")
 
@@ -69,32 +282,176 @@ class CSVProcessorBase:
         raise NotImplementedError("This method should be implemented in the subclass.")
 
     def add_status_column(self):
-        self.df["postStatus"] = "Empty"
+        self.df["postStatus"] = pd.Series("Empty", index=self.df.index, dtype="category")
+
+    def post_keys(self) -> pd.Series:
+        """What identifies each post of `self.df` to a reader, for the `duplicateOf` tag"""
+        raise NotImplementedError("This method should be implemented in the subclass.")
 
-    def process(self, timestamp_column: str, new_column_name: str, email_csv_filename: str, email_excel_filename: str):
-        self.merge_csv_files()
+    def mark_near_duplicates(self):
+        """Tags (or drops) the posts with emails or links that nearly repeat an earlier post"""
+        if self.near_duplicates is None or self.df is None or self.df.empty or 'text' not in self.df.columns:
+            return
+        candidates = (self.df['email_count'] > 0) | (self.df['link_count'] > 0)
+        duplicate_of = pd.Series("-", index=self.df.index, dtype=object)
+        if candidates.any():
+            rows = self.df[candidates]
+            duplicate_of[candidates] = self.near_duplicates.mark(self.source, self.post_keys()[candidates],
+                                                                 rows['text'], self.row_hashes(rows))
+        if self.drop_near_duplicates:
+            self.df = self.df[duplicate_of == "-"]
+            print(f"{int((duplicate_of != '-').sum())} near-duplicate posts dropped ✅")
+        else:
+            self.df['duplicateOf'] = duplicate_of.astype("category")
+
+    def _reset_near_duplicates(self):
+        """Only for an explicit full rebuild (not incremental), which re-tags every post of the source"""
+        if self.near_duplicates is not None:
+            self.near_duplicates.reset(self.source)
+
+    def transform(self, timestamp_column: str, new_column_name: str):
+        """Every step between merging and saving, on `self.df`"""
         self.fill_missing_values()
         self.process_emails_column()
         self.process_links_column()
         self.convert_timestamps(timestamp_column, new_column_name)
         self.add_status_column()
         self.drop_unimportant()
-        self.save_processed_data(email_csv_filename, email_excel_filename)
+        self.mark_near_duplicates()
+
+    def process(self, timestamp_column: str, new_column_name: str, email_csv_filename: str):
+        """Writes the output CSV only; its Excel copy is built on request by excel_export.ExcelExporter"""
+        if self.chunk_rows:
+            return self.process_chunked(timestamp_column, new_column_name, email_csv_filename)
+        if self.incremental:
+            return self.process_incremental(timestamp_column, new_column_name, email_csv_filename)
+        os.makedirs(self.save_dir, exist_ok=True)
+        manifest = self._open_manifest(os.path.join(self.save_dir, email_csv_filename))
+        self.merge_csv_files(manifest)
+        self.transform(timestamp_column, new_column_name)
+        self.save_processed_data(email_csv_filename, manifest)
+        manifest.save()
+
+    def _open_manifest(self, email_csv_filepath: str) -> ProcessedManifest:
+        """The save directory's manifest; reset unless incremental, since the output is then rebuilt from the whole history"""
+        manifest = ProcessedManifest(self.save_dir)
+        if not self.incremental:
+            manifest.reset()
+            self._reset_near_duplicates()
+            if os.path.exists(email_csv_filepath):
+                os.remove(email_csv_filepath)
+        elif manifest.is_stale():
+            # First incremental run or an output deleted: every raw file is read once more, but only rows
+            # no output in the directory holds are written
+            self._seed_manifest(manifest)  # Near-duplicate verdicts are kept per row, so they stay valid
+        return manifest
+
+    def _seed_manifest(self, manifest: ProcessedManifest):
+        """Restarts the manifest from the row hashes of the outputs in the save directory"""
+        manifest.reset()
+        for filename in sorted(os.listdir(self.save_dir)):
+            file_path = os.path.join(self.save_dir, filename)
+            if filename.endswith(('.csv.manifest.json', '.csv.rows.npy')):
+                os.remove(file_path)  # Per-output manifest of an earlier version
+            if not filename.endswith('.csv') or read_header(file_path)[:1] != ["Index"]:
+                continue  # Not a processor output (e.g. jobs_ai's updated_jobs.csv)
+            manifest.outputs[filename] = 0
+            for existing in pd.read_csv(file_path, index_col=0, chunksize=self.chunk_rows or 100000):
+                manifest.outputs[filename] += len(existing)
+                manifest.new_rows(self.row_hashes(existing))
+
+    def process_incremental(self, timestamp_column: str, new_column_name: str, email_csv_filename: str):
+        """Runs the same steps on the raw files not processed yet and appends the result"""
+        os.makedirs(self.save_dir, exist_ok=True)
+        manifest = self._open_manifest(os.path.join(self.save_dir, email_csv_filename))
+
+        self.merge_csv_files(manifest)
+        if self.df.empty:
+            print("No new raw files to process ✅")
+            manifest.save()
+            return
+        self.transform(timestamp_column, new_column_name)
+        self.append_processed_data(manifest, email_csv_filename)
+        manifest.save()
+
+    def process_chunked(self, timestamp_column: str, new_column_name: str, email_csv_filename: str):
+        """
+        Streams the raw data through the same steps `chunk_rows` at a time, appending each chunk's
+        rows to the output, so memory is bounded by the chunk size plus 8 bytes per output row for
+        dedup. Processes everything, or only new raw files when incremental.
+        """
+        os.makedirs(self.save_dir, exist_ok=True)
+        email_csv_filepath = os.path.join(self.save_dir, email_csv_filename)
+        manifest = self._open_manifest(email_csv_filepath)
+
+        appended = chunks = 0
+        for chunk in self.iter_raw_chunks(manifest):
+            self.df = chunk
+            self.transform(timestamp_column, new_column_name)
+            appended += self.append_rows(manifest, email_csv_filepath)
+            chunks += 1
+            self.df = None
+        manifest.save()
+
+        if not chunks:
+            print("No new raw files to process ✅")
+        elif not appended:
+            print("No new data where email_count > 0 ⚠️")
+        else:
+            print(f"{appended} rows from {chunks} chunks saved ✅ to {email_csv_filepath}")
 
     def drop_unimportant(self):
         raise NotImplementedError("This method should be implemented in the subclass.")
 
-    def save_processed_data(self, email_csv_filename: str = 'filtered_data.csv', email_excel_filename: str = 'filtered_data.xlsx'):
+    @staticmethod
+    def row_hashes(df: pd.DataFrame) -> np.ndarray:
+        """64-bit hash per row of the values as written to CSV, for dedup across runs and outputs"""
+        columns = sorted(df.columns)  # Outputs written from different raw files order their columns differently
+        return pd.util.hash_pandas_object(df[columns].astype(str), index=False).to_numpy()
+
+    def append_rows(self, manifest: ProcessedManifest, email_csv_filepath: str) -> int:
+        """Appends the rows of `self.df` with emails or links that no output holds yet; returns how many"""
+        filtered_df = self.df[(self.df['email_count'] > 0) | (self.df['link_count'] > 0)]
+        exists = os.path.exists(email_csv_filepath)
+        if exists:
+            # New fields are dropped and missing ones filled, so every appended row fits the header
+            header = pd.read_csv(email_csv_filepath, nrows=0, index_col=0).columns
+            filtered_df = filtered_df.reindex(columns=header, fill_value="-")
+        filtered_df = filtered_df[manifest.new_rows(self.row_hashes(filtered_df))]
+        if filtered_df.empty:
+            return 0
+
+        output_name = os.path.basename(email_csv_filepath)
+        output_rows = manifest.outputs.get(output_name, 0) if exists else 0
+        filtered_df.index = pd.RangeIndex(output_rows, output_rows + len(filtered_df))
+        filtered_df.to_csv(email_csv_filepath, mode='a', header=not exists, index=True, index_label="Index")
+        manifest.outputs[output_name] = output_rows + len(filtered_df)
+        return len(filtered_df)
+
+    def append_processed_data(self, manifest: ProcessedManifest, email_csv_filename: str = 'filtered_data.csv'):
+        """Appends the new rows with emails or links to the output CSV"""
+        email_csv_filepath = os.path.join(self.save_dir, email_csv_filename)
+        appended = self.append_rows(manifest, email_csv_filepath)
+        if not appended:
+            print("No new data where email_count > 0 ⚠️")
+            return
+        print(f"{appended} new rows appended ✅ to {email_csv_filepath}")
+
+    def save_processed_data(self, email_csv_filename: str = 'filtered_data.csv', manifest: ProcessedManifest = None):
+        """Writes the rows with emails or links to the output CSV, recording them in `manifest` when given"""
         os.makedirs(self.save_dir, exist_ok=True)
         email_csv_filepath = os.path.join(self.save_dir, email_csv_filename)
-        email_excel_filepath = os.path.join(self.save_dir, email_excel_filename)
         
         if self.df is not None and not self.df.empty:
             filtered_df = self.df[(self.df['email_count'] > 0) | (self.df['link_count'] > 0)].drop_duplicates().reset_index(drop=True)
             if not filtered_df.empty:
+                if manifest is not None:
+                    manifest.new_rows(self.row_hashes(filtered_df))
+                    manifest.outputs[email_csv_filename] = len(filtered_df)
+                else:
+                    ProcessedManifest(self.save_dir).remove()  # Written outside the manifest: incremental state is stale
                 filtered_df.to_csv(email_csv_filepath, index=True, index_label="Index")
-                filtered_df.to_excel(email_excel_filepath, index=True, index_label="Index")
-                print(f"Filtered data saved ✅ to {email_csv_filepath} and {email_excel_filepath}")
+                print(f"Filtered data saved ✅ to {email_csv_filepath}")
             else:
                 print("No data where email_count > 0 ⚠️")
         else:
@@ -102,6 +459,13 @@ class CSVProcessorBase:
     
 # ------------- Linkedin CSV Processor ----------------- #
 class LinkedInCSVProcessor(CSVProcessorBase):
+    source = "linkedin"
+    schema = LINKEDIN_RAW_SCHEMA
+    raw_columns = [  # What the output keeps, plus the timestamp it converts; authorProfileId, inputUrl and urn are dropped
+        "authorFollowersCount", "authorHeadline", "authorName", "authorProfileUrl", "authorType", "image", "isRepost",
+        "postedAtISO", "postedAtTimestamp", "scrappingDate", "text", "timeSincePosted", "title", "url",
+    ]
+
     def convert_timestamps(self, timestamp_column: str, new_column_name: str):
         if self.df is not None and timestamp_column in self.df.columns:
             self.df[new_column_name] = pd.to_datetime(self.df[timestamp_column], unit='ms')
@@ -110,12 +474,24 @@ class LinkedInCSVProcessor(CSVProcessorBase):
             
     def drop_unimportant(self):
         if self.df is not None:
-            self.df.drop(columns=["authorProfileId", "inputUrl", "postedAtTimestamp", "urn"], inplace=True)
+            self.df.drop(columns=["authorProfileId", "inputUrl", "postedAtTimestamp", "urn"], inplace=True, errors="ignore")
         else:
             print("DataFrame is empty. No columns to drop.")
 
+    def post_keys(self) -> pd.Series:
+        if 'url' not in self.df.columns:
+            return self.df.index.to_series().astype(str)
+        return self.df['url'].astype(str).str.split('?').str[0]  # Without the tracking parameters
+
 # ------------- Telegram CSV Processor ----------------- #
 class TelegramCSVProcessor(CSVProcessorBase):
+    source = "telegram"
+    schema = TELEGRAM_RAW_SCHEMA
+    raw_columns = [  # Everything the output keeps; id is dropped
+        "authorName", "authorTelegram", "channelName", "date", "forwardedFromUrl", "forwardedTitle", "linkPreview",
+        "repliedTo", "scrappingDate", "text", "viewsCount",
+    ]
+
     def convert_timestamps(self, timestamp_column: str, new_column_name: str):
         if self.df is not None and timestamp_column in self.df.columns:
             self.df[new_column_name] = pd.to_datetime(self.df[timestamp_column]).dt.tz_convert(None)
@@ -124,10 +500,15 @@ class TelegramCSVProcessor(CSVProcessorBase):
             
     def drop_unimportant(self):
         if self.df is not None:
-            self.df.drop(columns=["id"], inplace=True)
+            self.df.drop(columns=["id"], inplace=True, errors="ignore")
         else:
             print("DataFrame is empty. No columns to drop.")
 
+    def post_keys(self) -> pd.Series:
+        channels = self.df['channelName'].astype(str) if 'channelName' in self.df.columns else "-"
+        dates = self.df['date'].astype(str) if 'date' in self.df.columns else self.df.index.to_series().astype(str)
+        return channels + "/" + dates
+
 
 
 # # Usage
@@ -140,7 +521,6 @@ class TelegramCSVProcessor(CSVProcessorBase):
 #     'date',  # The timestamp column you want to convert
 #     'postTime',           # The new column name for converted timestamps
 #     'filter_data2.csv',     # CSV file to save rows where email_count | link_count > 0
-#     'filter_data2.xlsx',    # Excel file to save rows where email_count | link_count > 0
 
 # )
 
@@ -154,6 +534,5 @@ class TelegramCSVProcessor(CSVProcessorBase):
 #     'postedAtTimestamp',  # The timestamp column you want to convert
 #     'postTime',           # The new column name for converted timestamps
 #     'filter_data2.csv',     # CSV file to save rows where email_count | link_count > 0
-#     'filter_data2.xlsx',    # Excel file to save rows where email_count | link_count > 0
 
 # )
\ No newline at end of file
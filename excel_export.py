@@ -0,0 +1,98 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from openpyxl import Workbook
+
+from csv_ingest import read_header
+
+# ------------- On-demand Excel export ----------------- #
+#
+# Processed data and GPT results are written as CSV only. An Excel copy is built when
+# someone asks for it, on a background thread, streamed through openpyxl's write-only
+# workbook, and kept next to the CSV until the CSV changes.
+
+
+def csv_to_excel(csv_path: str, excel_path: str, chunk_rows: int = 50000):
+    """Copies a CSV to an Excel sheet through openpyxl's write-only mode, a chunk of rows at a time"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(read_header(csv_path))
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(excel_path)
+
+
+class ExcelExporter:
+    """
+    Builds and caches the Excel copy of a CSV. The copy is stamped with its CSV's mtime,
+    so it is fresh while the two match and rebuilt on the next request once the CSV has
+    been rewritten or appended to. One build per copy runs at a time; a build that
+    failed is only retried for a newer CSV.
+    """
+
+    def __init__(self, workers: int = 1, chunk_rows: int = 50000):
+        self.logger = logging.getLogger(__name__)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel-export")
+        self.chunk_rows = chunk_rows
+        self._lock = threading.Lock()
+        self._builds = {}  # Excel path -> Future of its latest build
+        self._failures = {}  # Excel path -> (CSV mtime it failed for, error)
+
+    @staticmethod
+    def excel_path(csv_path: str) -> str:
+        return os.path.splitext(csv_path)[0] + ".xlsx"
+
+    @staticmethod
+    def is_fresh(csv_path: str, excel_path: str) -> bool:
+        return os.path.exists(excel_path) and os.stat(excel_path).st_mtime_ns == os.stat(csv_path).st_mtime_ns
+
+    def _build(self, csv_path: str, excel_path: str, csv_mtime: int):
+        tmp_path = f"{excel_path}.tmp"
+        try:
+            csv_to_excel(csv_path, tmp_path, self.chunk_rows)
+            os.utime(tmp_path, ns=(csv_mtime, csv_mtime))  # Appends made meanwhile leave it stale
+            os.replace(tmp_path, excel_path)
+        except Exception as e:
+            self.logger.error(f"Excel export of {csv_path} failed: {e}")
+            with self._lock:
+                self._failures[excel_path] = (csv_mtime, str(e))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.logger.info(f"Excel export of {csv_path} saved to {excel_path}")
+        return excel_path
+
+    def request(self, csv_path: str, excel_path: str = None) -> dict:
+        """
+        Status of the Excel copy of `csv_path` ("ready", "building" or "failed") and its path,
+        starting a background build when the copy is missing or stale.
+        """
+        excel_path = excel_path or self.excel_path(csv_path)
+        csv_mtime = os.stat(csv_path).st_mtime_ns  # FileNotFoundError for a missing CSV
+        with self._lock:
+            build = self._builds.get(excel_path)
+            if build is not None and not build.done():
+                return {"status": "building", "path": excel_path}
+            if self.is_fresh(csv_path, excel_path):
+                return {"status": "ready", "path": excel_path}
+            failed_mtime, error = self._failures.get(excel_path, (None, None))
+            if failed_mtime == csv_mtime:
+                return {"status": "failed", "path": excel_path, "error": error}
+            self._failures.pop(excel_path, None)
+            self._builds[excel_path] = self.executor.submit(self._build, csv_path, excel_path, csv_mtime)
+        return {"status": "building", "path": excel_path}
+
+    def export(self, csv_path: str, excel_path: str = None, timeout: float = None) -> str:
+        """Blocking variant of `request` for scripts: the path of a fresh Excel copy"""
+        excel_path = excel_path or self.excel_path(csv_path)
+        status = self.request(csv_path, excel_path)
+        if status["status"] == "failed":
+            raise RuntimeError(f"Excel export of {csv_path} failed: {status['error']}")
+        build = self._builds.get(excel_path)
+        if status["status"] == "building" and build is not None:
+            build.result(timeout)
+        return excel_path
@@ -2,10 +2,10 @@ import os
 import pandas as pd
 import json
 import logging
-import sys
 import time
 from datetime import datetime  # Import the datetime module
 from gpt_client import client, get_response
+from crawlers.log_setup import setup_logging
 
 class JobProcessor:
     def __init__(self, csv_path, log_path="job_processing.log", duration_limit=3):
@@ -21,14 +21,8 @@ class JobProcessor:
         self._setup_logging(log_path)
 
     def _setup_logging(self, log_path):
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_path, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        # File writes happen on the log listener thread, not on the event loop
+        setup_logging(level=logging.INFO, log_path=log_path)
 
     def _load_job_posts(self):
         csv_files = [f for f in os.listdir(self.csv_path) if f.endswith(".csv")]
@@ -42,8 +36,10 @@ class JobProcessor:
         
         self.df = self.df[self.df["email_count"] > 0]
 
-        # Filter to exclude "Completed Extraction"
+        # Filter to exclude "Completed Extraction" and posts repeating an earlier one
         filtered_df = self.df[self.df["postStatus"] != "Completed Extraction"]
+        if "duplicateOf" in filtered_df.columns:
+            filtered_df = filtered_df[filtered_df["duplicateOf"].fillna("-") == "-"]
         return filtered_df["text"].tolist()
 
     def _update_post_status(self):
@@ -68,7 +64,8 @@ class JobProcessor:
         except Exception as e:
             logging.error(f"Error saving to JSON file: {e}")
 
-    def save_jobs_to_csv_and_xlsx(self):
+    def save_jobs_to_csv(self):
+        """CSV only; the Excel copy is built on request by excel_export.ExcelExporter"""
         try:
             # Convert the list of jobs to a DataFrame
             df = pd.DataFrame(self.all_jobs)
@@ -81,16 +78,11 @@ class JobProcessor:
                 csv_file_path = self.json_path.replace(".json", ".csv")
                 df.to_csv(csv_file_path, index=False, encoding='utf-8')
                 logging.info(f"Job results have been saved to CSV file: {csv_file_path}")
-
-                # Save DataFrame to Excel
-                xlsx_file_path = self.json_path.replace(".json", ".xlsx")
-                df.to_excel(xlsx_file_path, index=False, engine='openpyxl')
-                logging.info(f"Job results have been saved to Excel file: {xlsx_file_path}")
             else:
                 logging.warning("No jobs to save. The DataFrame is empty.")
 
         except Exception as e:
-            logging.error(f"Error saving to CSV or Excel files: {e}")
+            logging.error(f"Error saving to CSV file: {e}")
 
 
     async def fetch_job_post(self, prompt):
@@ -117,7 +109,7 @@ class JobProcessor:
                     
         self._update_post_status()
         self._save_jobs_to_json()
-        self.save_jobs_to_csv_and_xlsx()  
+        self.save_jobs_to_csv()
 
 # if __name__ == "__main__":
 #     try:
@@ -0,0 +1,196 @@
+import functools
+import itertools
+import unicodedata
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, Column, BigInteger, String, DateTime, delete, func, select
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+Base = declarative_base()
+
+URL_REGEX = r'https?://[^\s]+'  # Tracking parameters differ between reposts
+HASHTAG_REGEX = r'#[^\s#]+'  # The same tag lists end unrelated ads
+ASTRAL_REGEX = r'[\U00010000-\U0010FFFF]'  # Emoji and other symbols outside the translate table
+TATWEEL = 0x0640
+
+MIX = np.uint64(0x9E3779B97F4A7C15)
+FINALIZE = np.uint64(0xFF51AFD7ED558CCD)
+
+# ----------------- Near-duplicate posts -------------------- #
+#
+# Every post with emails or links gets a 64-bit SimHash of its normalized word shingles.
+# Two posts are near-duplicates when at most `max_distance` of their bits differ. Split
+# into max_distance + 1 bands, two such fingerprints agree on a whole band (pigeonhole),
+# so each band value is an LSH bucket and only posts sharing a bucket are compared.
+
+
+class PostFingerprint(Base):
+    __tablename__ = "post_fingerprints"
+
+    row_hash = Column(BigInteger, primary_key=True)  # The processed row, so reprocessing it gives the same verdict
+    fingerprint = Column(BigInteger, nullable=False)  # SimHash of the text, as a signed 64-bit integer
+    source = Column(String, nullable=False, index=True)  # "linkedin" or "telegram"
+    post_key = Column(String, nullable=False)  # URL of a LinkedIn post, channel/date of a Telegram one
+    duplicate_of = Column(String, nullable=True)  # "source:post_key" of the original; None for originals
+    first_seen = Column(DateTime, nullable=False, default=datetime.now)
+
+
+@functools.lru_cache(maxsize=None)
+def _word_table() -> dict:
+    """str.translate table: combining marks (Arabic diacritics...) and tatweel dropped, other non-word characters to spaces"""
+    table = {}
+    for code in range(0x10000):
+        char = chr(code)
+        if unicodedata.category(char) == "Mn" or code == TATWEEL:
+            table[code] = None
+        elif not char.isalnum():
+            table[code] = " "
+    return table
+
+
+def normalize_texts(texts: pd.Series) -> pd.Series:
+    """Case, Unicode forms, URLs, hashtags, diacritics and punctuation removed; words separated by spaces"""
+    texts = texts.fillna("").astype(str).str.normalize("NFKC").str.lower()
+    texts = texts.str.replace(URL_REGEX, " ", regex=True).str.replace(HASHTAG_REGEX, " ", regex=True)
+    return texts.str.replace(ASTRAL_REGEX, " ", regex=True).str.translate(_word_table())
+
+
+def simhash(texts: pd.Series, shingle_size: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    64-bit SimHash per text over its `shingle_size`-word shingles (the words themselves
+    for shorter texts), and whether the text had any word. Vectorized over the column.
+    """
+    token_lists = [text.split() for text in normalize_texts(texts)]
+    lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+    tokens = np.fromiter(itertools.chain.from_iterable(token_lists), dtype=object, count=int(lengths.sum()))
+    codes, unique = pd.factorize(tokens)
+    words = pd.util.hash_array(np.asarray(unique, dtype=object))[codes]  # Stable across processes, unlike hash()
+    docs = np.repeat(np.arange(len(token_lists)), lengths)
+
+    # One hash per token position, in text order: its shingle, or the word itself in short texts
+    hashes, keep = words.copy(), lengths[docs] < shingle_size
+    if len(words) >= shingle_size:
+        end = len(words) - shingle_size + 1
+        combined = words[:end].copy()
+        for offset in range(1, shingle_size):
+            combined = combined * MIX + words[offset:end + offset]  # Wraps around, as hashes should
+        combined ^= combined >> np.uint64(33)
+        combined *= FINALIZE
+        combined ^= combined >> np.uint64(33)
+        whole = docs[:end] == docs[shingle_size - 1:]  # Shingles that don't straddle two texts
+        hashes[:end][whole] = combined[whole]
+        keep[:end] |= whole
+    hashes, owners = hashes[keep], docs[keep]
+
+    fingerprints = np.zeros(len(token_lists), dtype=np.uint64)
+    if not len(owners):
+        return fingerprints, lengths > 0
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    totals = np.diff(np.r_[starts, len(owners)])
+    packed = np.zeros(len(starts), dtype=np.uint64)
+    for bit in range(64):
+        ones = np.add.reduceat((hashes >> np.uint64(bit)) & np.uint64(1), starts)
+        packed |= (ones * 2 > totals).astype(np.uint64) << np.uint64(bit)
+    fingerprints[owners[starts]] = packed
+    return fingerprints, lengths > 0
+
+
+class NearDuplicateIndex:
+    """
+    Persistent SimHash index of the posts of every run and both sources. `mark` tells, for
+    each new post, which earlier post it nearly repeats: one whose fingerprint shares at
+    least `threshold` of its 64 bits (0.95: at most 3 differ). Only originals are indexed
+    for matching, so a repost matches the first version, not a chain of edits. Verdicts
+    are stored per row, so a reprocessed row keeps its verdict.
+    """
+
+    def __init__(self, db_path="post_index.db", threshold=0.95, shingle_size=3):
+        if not 0.5 <= threshold <= 1:
+            raise ValueError(f"Near-duplicate threshold must be between 0.5 and 1, got {threshold}")
+        self.engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_distance = int((1 - threshold) * 64 + 1e-9)
+        edges = np.linspace(0, 64, self.max_distance + 2).astype(int)
+        self._bands = [(int(lo), (1 << int(hi - lo)) - 1) for lo, hi in zip(edges[:-1], edges[1:])]
+        self._verdicts = None  # Row hash -> "source:post_key" of its original, "-" for originals
+        self._buckets = None  # Per band: band value -> [(fingerprint, "source:post_key")] of originals
+
+    def _load(self):
+        if self._verdicts is not None:
+            return
+        self._verdicts = {}
+        self._buckets = [{} for _ in self._bands]
+        with self.Session() as session:
+            rows = session.execute(select(PostFingerprint.row_hash, PostFingerprint.fingerprint,
+                                          PostFingerprint.source, PostFingerprint.post_key,
+                                          PostFingerprint.duplicate_of))
+            for row_hash, fingerprint, source, post_key, duplicate_of in rows:
+                self._verdicts[row_hash] = duplicate_of or "-"
+                if duplicate_of is None:
+                    self._add_original(fingerprint & 0xFFFFFFFFFFFFFFFF, f"{source}:{post_key}")
+
+    def _add_original(self, fingerprint: int, label: str):
+        for buckets, (shift, mask) in zip(self._buckets, self._bands):
+            buckets.setdefault((fingerprint >> shift) & mask, []).append((fingerprint, label))
+
+    def _nearest(self, fingerprint: int):
+        """Label of the closest indexed original within `max_distance` bits, None if there is none"""
+        best, best_distance = None, self.max_distance + 1
+        for buckets, (shift, mask) in zip(self._buckets, self._bands):
+            for candidate, label in buckets.get((fingerprint >> shift) & mask, ()):
+                distance = (candidate ^ fingerprint).bit_count()
+                if distance < best_distance:
+                    best, best_distance = label, distance
+        return best
+
+    def mark(self, source: str, post_keys: pd.Series, texts: pd.Series, row_hashes: np.ndarray) -> pd.Series:
+        """
+        "source:post_key" of the earlier post each text nearly repeats, "-" for originals and
+        texts without words, aligned with `texts`. New posts are indexed and saved.
+        """
+        self._load()
+        row_hashes = row_hashes.view(np.int64).tolist()  # SQLite integers are signed
+        unseen = np.fromiter((row_hash not in self._verdicts for row_hash in row_hashes), dtype=bool, count=len(texts))
+        fingerprints, has_words = np.zeros(len(texts), dtype=np.uint64), np.zeros(len(texts), dtype=bool)
+        if unseen.any():
+            fingerprints[unseen], has_words[unseen] = simhash(texts[unseen], self.shingle_size)
+        verdicts, new_rows = [], []
+        rows = zip(fingerprints.tolist(), fingerprints.view(np.int64).tolist(), has_words.tolist(), row_hashes, post_keys)
+        for fingerprint, signed_fingerprint, has_text, row_hash, post_key in rows:
+            if row_hash in self._verdicts or not has_text:
+                verdicts.append(self._verdicts.get(row_hash, "-"))
+                continue
+            duplicate_of = self._nearest(fingerprint)
+            if duplicate_of is None:
+                self._add_original(fingerprint, f"{source}:{post_key}")
+            self._verdicts[row_hash] = duplicate_of or "-"
+            verdicts.append(duplicate_of or "-")
+            new_rows.append({"row_hash": row_hash, "fingerprint": signed_fingerprint,
+                             "source": source, "post_key": str(post_key), "duplicate_of": duplicate_of,
+                             "first_seen": datetime.now()})
+
+        if new_rows:
+            with self.engine.begin() as connection:  # Core executemany: far faster than ORM inserts
+                connection.execute(PostFingerprint.__table__.insert(), new_rows)
+        return pd.Series(verdicts, index=texts.index, dtype=object)
+
+    def reset(self, source: str):
+        """Forgets a source's posts, before its output is rebuilt from the whole raw history"""
+        with self.Session() as session, session.begin():
+            session.execute(delete(PostFingerprint).where(PostFingerprint.source == source))
+        self._verdicts = self._buckets = None
+
+    def summary(self) -> dict:
+        """Indexed posts and near-duplicates per source"""
+        with self.Session() as session:
+            rows = session.execute(
+                select(PostFingerprint.source, func.count(), func.count(PostFingerprint.duplicate_of))
+                .group_by(PostFingerprint.source)
+            )
+            sources = {source: {"posts": posts, "near_duplicates": duplicates} for source, posts, duplicates in rows}
+        return {"threshold": self.threshold, "max_distance_bits": self.max_distance, "sources": sources}
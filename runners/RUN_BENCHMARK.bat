@@ -0,0 +1,2 @@
+@echo off
+start cmd /k "python -m benchmarks.manager_load --sizes 10 100 1000 --output bench_results.json"
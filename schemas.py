@@ -0,0 +1,58 @@
+# ------------- Column schemas ----------------- #
+#
+# Declared column types of every CSV source, as csv_ingest aliases: "category" for text that
+# repeats across rows (authors, channels, files, statuses, places), stored once per distinct
+# value; "int32" for counts; "timestamp[ns]" for timestamps written without a zone offset;
+# "string" for free text. Undeclared columns are inferred.
+
+# Raw scraper output. Dates stay text here so the processed CSVs keep them as scraped.
+LINKEDIN_RAW_SCHEMA = {
+    **{column: "string" for column in (
+        "image", "postedAtISO", "text", "title", "url", "urn")},
+    **{column: "category" for column in (
+        "authorFollowersCount", "authorHeadline", "authorName", "authorProfileId", "authorProfileUrl",
+        "authorType", "inputUrl", "scrappingDate", "timeSincePosted")},
+}
+
+TELEGRAM_RAW_SCHEMA = {
+    **{column: "string" for column in (
+        "date", "linkPreview", "repliedTo", "text")},
+    **{column: "category" for column in (
+        "authorName", "authorTelegram", "channelName", "forwardedFromUrl", "forwardedTitle", "scrappingDate",
+        "viewsCount")},
+}
+
+# Columns the CSV processors add
+PROCESSED_COLUMNS_SCHEMA = {
+    "emails": "string",
+    "links": "string",
+    "email_count": "int32",
+    "link_count": "int32",
+    "postTime": "timestamp[ns]",
+    "postStatus": "category",
+    "source_file": "category",
+    "duplicateOf": "category",  # "-", or source:post of the earlier post it repeats
+}
+
+# Processor output, read by the dashboard
+LINKEDIN_PROCESSED_SCHEMA = {
+    **{column: alias for column, alias in LINKEDIN_RAW_SCHEMA.items()
+       if column not in ("authorProfileId", "inputUrl", "urn")},  # Dropped by the processor
+    "scrappingDate": "timestamp[ns]",
+    **PROCESSED_COLUMNS_SCHEMA,
+}
+
+TELEGRAM_PROCESSED_SCHEMA = {
+    **TELEGRAM_RAW_SCHEMA,
+    "scrappingDate": "timestamp[ns]",
+    **PROCESSED_COLUMNS_SCHEMA,
+}
+
+# jobs_ai output (one row per job), read by the users/orders manager and the dashboard
+EMAILS_DATABASE_SCHEMA = {
+    **{column: "string" for column in (
+        "company_name", "job_title", "sectors", "email")},
+    **{column: "category" for column in (
+        "city", "region", "specialization", "experience", "education", "domain")},
+    "date": "timestamp[ns]",
+}
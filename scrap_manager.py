@@ -1,7 +1,17 @@
 import asyncio
+import itertools
 import os
+from datetime import date as dt_date
 from crawlers.linkedin_apify import ApifyLinkedInScraper
 from crawlers.telegram_apify import ApifyTelegramScraper
+from crawlers.results_sink import RawResultsSink, SplitResultsSink
+from crawlers.run_multiplexer import RunMultiplexer
+from crawlers.concurrency import AIMDController
+from crawlers.scrape_ledger import ScrapeLedger, SUCCEEDED, FAILED, ABORTED
+from crawlers.deadline import ScrapeDeadline
+from crawlers.api_quota import QuotaExceededError
+from crawlers.keyword_scheduler import YieldTally
+from crawlers.cookie_pool import CookiePool, NoHealthySessionError
 from search_keywords.keywords_comb import KeywordCombinations
 from config import APIFY_API_TOKEN
 
@@ -17,19 +27,54 @@ class LinkedInScraperManager:
                  max_workers=5,
                  search_with_keywords=True,
                  generate_combinations=True,
-                 time_limit=100):
+                 time_limit=100,
+                 webhook_url=None,
+                 api_url=None,
+                 max_in_flight_runs=10,
+                 batch_size=10,
+                 queue_maxsize=100,
+                 adaptive_concurrency=True,
+                 ledger=None,
+                 sweep_id=None,
+                 raw_store=None,
+                 drain_time=60,
+                 flush_timeout=120,
+                 scheduler=None,
+                 cookie_pool=None,
+                 input_window=5000):
         
-        self.scraper = ApifyLinkedInScraper(api_token, cookies, date=date, search_with_keywords=search_with_keywords)
+        self.scraper = ApifyLinkedInScraper(api_token, cookies, date=date, search_with_keywords=search_with_keywords,
+                                            webhook_url=webhook_url, api_url=api_url)
         self.keywords_path = keywords_path
         self.urls_path = urls_path
         self.save_path = save_path
         self.date = date
         self.max_workers = max_workers
+        # Concurrent actor runs grow/shrink with run health, up to max_in_flight_runs
+        controller = AIMDController(max_limit=max_in_flight_runs, adaptive=adaptive_concurrency)
+        self.multiplexer = RunMultiplexer(max_in_flight=max_in_flight_runs, controller=controller,
+                                          release_run=self.scraper.backend.release_run)
+        self.batch_size = batch_size  # Keywords/URLs packed into one actor run
         self.search_with_keywords = search_with_keywords
         self.generate_combinations = generate_combinations
         self.csv_keywords = csv_keywords
-        self.queue = asyncio.Queue()
+        self.queue = asyncio.Queue(maxsize=queue_maxsize)  # Bounded, so the feeder waits for the workers
+        self.input_window = input_window  # Inputs read, ranked and checked against the ledger at a time
         self.time_limit = time_limit  # Time limit in minutes
+        # No new runs `drain_time` seconds before the limit; at the limit runs are aborted and flushed
+        self.deadline = ScrapeDeadline(time_limit, drain_time)
+        self.flush_timeout = flush_timeout
+        self.ledger = ledger or ScrapeLedger()
+        # Inputs are skipped/resumed within one sweep: same input type and date window, same day
+        mode = "keywords" if search_with_keywords else "urls"
+        self.sweep_id = sweep_id or f"{mode}:{date}:{dt_date.today().isoformat()}"
+        self.raw_store = raw_store  # Partitioned Parquet store; None keeps the CSV files
+        self._resumed_inputs = set()
+        # Learns yield per compute unit and orders the inputs by it; None keeps file order
+        self.scheduler = scheduler
+        # One LinkedIn session leased per run; a bare cookie list is a pool of one with no extra run limit
+        self.cookie_pool = cookie_pool or CookiePool([cookies], max_runs_per_session=max_in_flight_runs)
+        self._sessions = {}  # run_id -> leased session, released exactly once when the run ends
 
         # Generate or read combinations
         if self.search_with_keywords:
@@ -45,119 +90,475 @@ class LinkedInScraperManager:
                 print("Keyword file not found, generating new combinations...")
                 KeywordCombinations.generate_and_save_combinations(self.csv_keywords, self.keywords_path)
 
-    async def _load_inputs(self):
-        if self.search_with_keywords:
-            inputs = KeywordCombinations.read_from_text(self.keywords_path)
-        else:
-            with open(self.urls_path, 'r') as f:
-                inputs = [line.strip() for line in f if line.strip()]
-                
-        for input_value in inputs[:5]:
-            await self.queue.put(input_value)
+    def _iter_inputs(self):
+        path = self.keywords_path if self.search_with_keywords else self.urls_path
+        return KeywordCombinations.iter_from_text(path)
+
+    def _read_window(self, inputs):
+        window = list(itertools.islice(inputs, self.input_window))
+        if self.scheduler is not None and window:
+            # Ranked within the window, so memory is bounded by the window size, not the input file
+            window = self.scheduler.order(window)
+        return window
+
+    async def _input_windows(self):
+        """The inputs, `input_window` at a time (best expected yield first with a scheduler), read off the event loop"""
+        inputs = self._iter_inputs()
+        while True:
+            window = await asyncio.to_thread(self._read_window, inputs)
+            if not window:
+                return
+            yield window
+
+    async def _unscraped(self, window):
+        """The inputs of a window neither saved earlier in the sweep nor resumed, with one ledger query"""
+        completed = await asyncio.to_thread(self.ledger.completed_inputs, "linkedin", self.sweep_id, window)
+        return [value for value in window if value not in completed and value not in self._resumed_inputs]
+
+    async def _resume_runs(self):
+        """Hands runs left RUNNING in the ledger (timeout, restart) back to the multiplexer"""
+        in_flight = await asyncio.to_thread(self.ledger.in_flight_runs, "linkedin", self.sweep_id)
+        for run_id, batch in in_flight.items():
+            await self.multiplexer.acquire_slot()
+            print(f"Resuming run {run_id} for {batch}")
+            self.multiplexer.track(run_id, self._finish_run, batch)
+            self._resumed_inputs.update(batch)
+
+    async def _feed_inputs(self):
+        """Streams the keyword/URL file into the bounded queue until it is exhausted or the soft deadline hits"""
+        await self._resume_runs()
+        fed = skipped = 0
+        windows = self._input_windows()
+        async for window in windows:
+            unscraped = await self._unscraped(window)
+            skipped += len(window) - len(unscraped)
+            for i, input_value in enumerate(unscraped):
+                if self.deadline.launching_stopped():
+                    not_fed = len(unscraped) - i
+                    async for rest in windows:
+                        not_fed += len(await self._unscraped(rest))
+                    self.deadline.not_fed = not_fed
+                    print(f"Soft deadline reached after feeding {fed} inputs, stopping feeder...")
+                    return
+                await self.queue.put(input_value)  # Blocks while the queue is full
+                fed += 1
+        print(f"All {fed} inputs fed to the workers ({skipped} already scraped or resumed).")
+
+    async def _next_batch(self):
+        """Waits for one input, then tops the batch up with whatever is already queued"""
+        batch = [await self.queue.get()]
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
 
     async def _worker(self):
         while True:
-            input_value = await self.queue.get()
-            if self.search_with_keywords:
-                print(f"Worker scraping for keyword: {input_value} with date: {self.date}")
-                run_id = await self.scraper.run_scraper(keyword=input_value)
-            else:
-                print(f"Worker scraping for URL: {input_value}")
-                run_id = await self.scraper.run_scraper(url=input_value)
-            
-            dataset_id = await self.scraper.monitor_scraping(run_id)
-            
-            if dataset_id:
-                results = await self.scraper.fetch_results(dataset_id)
-                filename_prefix = os.path.join(self.save_path, dataset_id)
-                json_filename = f"{filename_prefix}_results.json"
-                csv_filename = f"{filename_prefix}_results.csv"
-                self.scraper.save_results_json(results, json_filename)
-                self.scraper.save_results_csv(results, csv_filename)
-            
+            batch = await self._next_batch()
+            try:
+                if not await self.deadline.acquire_slot(self.multiplexer, batch):
+                    continue  # Past the soft deadline: drain the queue without launching
+                if self.search_with_keywords:
+                    print(f"Worker scraping for keywords: {batch} with date: {self.date}")
+                else:
+                    print(f"Worker scraping for URLs: {batch}")
+                session = None
+                try:
+                    session = await self.cookie_pool.lease()
+                    run_id = await self.scraper.run_scraper(inputs=batch, cookies=session.cookies)
+                    try:
+                        await asyncio.to_thread(self.ledger.mark_started, "linkedin", self.sweep_id, batch, run_id)
+                    except Exception as e:
+                        print(f"Could not record run {run_id} as started, {batch} will be scraped again: {e} ⚠️")
+                    finally:
+                        # Hand the run over and move straight on to the next batch; also when cancelled
+                        # here, so the run is still aborted at the deadline and its slot released
+                        self._sessions[run_id] = session
+                        self.multiplexer.track(run_id, self._finish_run, batch)
+                except (QuotaExceededError, NoHealthySessionError) as e:
+                    await self.multiplexer.release_slot()
+                    await self.cookie_pool.release(session)
+                    self.deadline.drop(batch)  # Budget spent or no usable account: reported like a deadline drop
+                    print(f"Not starting run for {batch}: {e} ⚠️")
+                except Exception as e:
+                    await self.multiplexer.release_slot(error=e)
+                    await self.cookie_pool.release(session)
+                    print(f"Failed to start run for {batch}: {e} ❌")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _finish_run(self, run_id, batch):
+        succeeded = items = None
+        try:
+            run_info = await self.scraper.wait_for_run(run_id)
+
+            if run_info["status"] != "SUCCEEDED":
+                succeeded = False
+                await asyncio.to_thread(self.ledger.mark_finished, "linkedin", self.sweep_id, batch, FAILED)
+                await self._record_yield(YieldTally(), run_info, batch)  # Failed runs still cost compute units
+                return False
+
+            dataset_id = run_info["defaultDatasetId"]
+            tally = YieldTally()
+            item_counts = await self._save_dataset(dataset_id, batch, observer=tally)
+            succeeded, items = True, sum(item_counts.values())
+            await asyncio.to_thread(self.ledger.mark_finished, "linkedin", self.sweep_id,
+                                    batch, SUCCEEDED, dataset_id, item_counts)
+            await self._record_yield(tally, run_info, batch)
+            return True
+        finally:
+            await self._release_session(run_id, succeeded, items)
+
+    async def _release_session(self, run_id, succeeded=None, items=None):
+        """Returns the run's LinkedIn session to the pool with the run's outcome (None if it was cut short)"""
+        await self.cookie_pool.release(self._sessions.pop(run_id, None), succeeded, items)
+
+    async def _save_dataset(self, dataset_id, batch, observer=None):
+        """Streams the dataset to disk and returns the number of items saved per input"""
+        filename_prefix = os.path.join(self.save_path, dataset_id)
+        links = self.scraper.get_input_links(batch)
+        # Items carry the link they came from in `inputUrl`; save them back per input
+        with SplitResultsSink(filename_prefix, links, store=self.raw_store, source="linkedin",
+                              partition_keys=batch, observer=observer) as sink:
+            await self.scraper.stream_results(dataset_id, sink)
+        counts = sink.counts
+        return {input_value: counts[link] for input_value, link in zip(batch, links)}
+
+    async def _record_yield(self, tally, run_info, batch):
+        if self.scheduler is None:
+            return
+        compute_units = (run_info.get("stats") or {}).get("computeUnits")
+        try:
+            await asyncio.to_thread(self.scheduler.record_run, tally, compute_units, batch)
+        except Exception as e:  # Yield stats must never fail a scrape
+            print(f"Could not record keyword yield for {batch}: {e} ⚠️")
+
+    async def _abort_run(self, run_id, batch):
+        """Aborts a run still going at the hard deadline and saves whatever its dataset already holds"""
+        await self._release_session(run_id)
+        run_info = await self.scraper.abort_run(run_id)
+        if run_info is None:  # Neither aborted nor found: nothing to save, the batch is scraped again
+            await asyncio.to_thread(self.ledger.mark_finished, "linkedin", self.sweep_id, batch, FAILED)
+            self.deadline.record_abort(run_id, batch, "UNKNOWN", 0)
+            return
+        if run_info["status"] == "FAILED":
+            await asyncio.to_thread(self.ledger.mark_finished, "linkedin", self.sweep_id, batch, FAILED)
+            return
+        dataset_id = run_info["defaultDatasetId"]
+        tally = YieldTally()
+        item_counts = await self._save_dataset(dataset_id, batch, observer=tally)
+        await self._record_yield(tally, run_info, batch)
+        if run_info["status"] == "SUCCEEDED":  # Finished just before the abort
+            await asyncio.to_thread(self.ledger.mark_finished, "linkedin", self.sweep_id,
+                                    batch, SUCCEEDED, dataset_id, item_counts)
+            return
+        await asyncio.to_thread(self.ledger.mark_finished, "linkedin", self.sweep_id,
+                                batch, ABORTED, dataset_id, item_counts)
+        self.deadline.record_abort(run_id, batch, run_info["status"], sum(item_counts.values()))
+
+    def _drain_queue(self):
+        """Records inputs still queued at the hard deadline as not launched"""
+        while not self.queue.empty():
+            self.deadline.drop([self.queue.get_nowait()])
             self.queue.task_done()
 
+    def _save_deadline_summary(self):
+        if not self.deadline.dropped_anything:
+            return
+        path = self.deadline.save_summary(self.save_path, "linkedin")
+        print(f"Deadline summary saved to {path}: {len(self.deadline.not_launched)} inputs not launched, "
+              f"{self.deadline.not_fed} not fed, {len(self.deadline.aborted_runs)} runs aborted ⚠️")
+
+    def concurrency_snapshot(self):
+        """Current in-flight run limit and its history, for diagnostics"""
+        return self.multiplexer.controller.snapshot()
+
+    async def _wait_until_done(self, feeder):
+        await feeder  # The whole input file is queued
+        await self.queue.join()  # Every input has a started run
+        await self.multiplexer.join()  # Every started run is saved
+
     async def start_scraping(self):
-        await self._load_inputs()
+        self.deadline.start()
+        feeder = asyncio.create_task(self._feed_inputs())
         workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
         
         # Monitor the scraping process with a time limit
         try:
-            if self.time_limit:
-                await asyncio.wait_for(self.queue.join(), timeout=self.time_limit * 60)
-            else:
-                await self.queue.join()
+            await asyncio.wait_for(self._wait_until_done(feeder), timeout=self.deadline.timeout)
         except asyncio.TimeoutError:
-            print("Time limit reached, stopping scraping...")
-        
-        for worker in workers:
-            worker.cancel()
+            print("Time limit reached, aborting in-flight runs and saving their partial results...")
+            feeder.cancel()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(feeder, *workers, return_exceptions=True)
+            self._drain_queue()
+            await self.multiplexer.abort_all(self._abort_run, timeout=self.flush_timeout)
+        finally:
+            feeder.cancel()
+            for worker in workers:
+                worker.cancel()
+            self.multiplexer.cancel_all()
+            self._save_deadline_summary()
 
 
 
 # -------------------- Telegram Scrap manager --------------------- #
 
 class TelegramScraperManager:
-    def __init__(self, api_token, channels, save_path, posts_from=10, posts_to=20, max_workers=1, time_limit=100):
+    def __init__(self, api_token, channels, save_path, posts_from=10, posts_to=20, max_workers=3, time_limit=100,
+                 webhook_url=None, api_url=None, max_in_flight_runs=10, adaptive_concurrency=True, ledger=None,
+                 incremental=False, latest_post_fetcher=None, max_range=1000, raw_store=None, drain_time=60,
+                 flush_timeout=120):
         """
         Initializes the Telegram scraper manager with required parameters.
+        `posts_from`/`posts_to` are either one range for every channel or one value per channel.
+        In incremental mode the range runs from each channel's high-water mark to the latest post
+        (`await latest_post_fetcher(channels)`: {channel: latest post id, None when unknown}), split
+        into sub-ranges of at most `max_range` posts. Channels whose latest post is unknown are not
+        scraped, and the scrape fails when no channel's is known.
+        With a `raw_store`, results go to its Parquet partitions (per channel and day) instead of CSV files.
+        No new run starts `drain_time` seconds before the time limit; runs still going at the limit are
+        aborted and their partial datasets saved, within `flush_timeout` seconds.
         """
-        self.scraper = ApifyTelegramScraper(api_token, channels, posts_from=posts_from, posts_to=posts_to)
+        self.scraper = ApifyTelegramScraper(api_token, channels, posts_from=posts_from, posts_to=posts_to,
+                                            webhook_url=webhook_url, api_url=api_url)
         self.channels = channels
         self.save_path = save_path
         self.posts_from = posts_from
         self.posts_to = posts_to
         self.max_workers = max_workers
+        # Concurrent actor runs grow/shrink with run health, up to max_in_flight_runs
+        controller = AIMDController(max_limit=max_in_flight_runs, adaptive=adaptive_concurrency)
+        self.multiplexer = RunMultiplexer(max_in_flight=max_in_flight_runs, controller=controller,
+                                          release_run=self.scraper.backend.release_run)
         self.queue = asyncio.Queue()
         self.time_limit = time_limit  # Time limit in minutes
+        self.deadline = ScrapeDeadline(time_limit, drain_time)
+        self.flush_timeout = flush_timeout
+        self.ledger = ledger or ScrapeLedger()
+        self.sweep_id = "telegram"  # Ledger inputs carry the posts range, so a range is never scraped twice
+        self.incremental = incremental
+        self.latest_post_fetcher = latest_post_fetcher
+        self.max_range = max_range
+        self.raw_store = raw_store
+        self._jobs = []
+        self._succeeded = set()  # Ledger inputs saved during this scrape
+
+    def _channel_jobs(self):
+        """One (channel, posts_from, posts_to) job per channel; ValueError when the per-channel lists don't match"""
+        count = len(self.channels)
+        posts_from = self.posts_from if isinstance(self.posts_from, list) else [self.posts_from] * count
+        posts_to = self.posts_to if isinstance(self.posts_to, list) else [self.posts_to] * count
+        return list(zip(self.channels, posts_from, posts_to, strict=True))
+
+    async def _incremental_jobs(self):
+        """Jobs covering each channel from its high-water mark to its latest post"""
+        jobs = []
+        latest_posts = await self.latest_post_fetcher(self.channels)  # One Telegram connection for every channel
+        unknown = [channel for channel in self.channels if latest_posts.get(channel) is None]
+        if self.channels and len(unknown) == len(self.channels):
+            raise RuntimeError(f"Latest post unknown for every channel: {', '.join(unknown)}")
+        for channel in self.channels:
+            latest = latest_posts.get(channel)
+            if latest is None:
+                print(f"Latest post of {channel} unknown, not scraped ❌")
+                continue
+            mark = await asyncio.to_thread(self.ledger.get_high_water_mark, channel)
+            # First incremental scrape of a channel: start with its last `max_range` posts
+            start = mark + 1 if mark is not None else max(1, latest - self.max_range + 1)
+            if latest < start:
+                print(f"No new posts in {channel} (mark: {mark}, latest: {latest})")
+                continue
+            for posts_from in range(start, latest + 1, self.max_range):
+                jobs.append((channel, posts_from, min(posts_from + self.max_range - 1, latest)))
+            print(f"Incremental scrape of {channel}: posts {start}-{latest}")
+        return jobs
+
+    def _advance_marks(self):
+        """Moves each channel's mark over the contiguous run of sub-ranges saved from its current mark"""
+        for channel in {job[0] for job in self._jobs}:
+            mark = self.ledger.get_high_water_mark(channel)
+            new_mark = mark
+            for job in sorted(job for job in self._jobs if job[0] == channel):
+                _, posts_from, posts_to = job
+                if self._ledger_input(job) not in self._succeeded:
+                    break
+                if new_mark is not None and posts_from > new_mark + 1:
+                    break  # A gap; the next incremental scrape starts there
+                new_mark = posts_to
+            if new_mark is not None and new_mark != mark:
+                self.ledger.set_high_water_mark(channel, new_mark)
+                print(f"High-water mark of {channel} moved to {new_mark}")
+
+    @staticmethod
+    def _ledger_input(job):
+        channel, posts_from, posts_to = job
+        return f"{channel}:{posts_from}-{posts_to}"
+
+    @staticmethod
+    def _channel_name(channel):
+        """'https://t.me/jobsmadina' -> 'jobsmadina', safe to use in file names"""
+        return channel.rstrip('/').split('/')[-1]
 
     async def _load_channels(self):
         """
-        Loads the channels into the queue for scraping.
+        Resumes unfinished runs, then queues one job per channel whose range wasn't scraped yet.
         """
-        for channel in self.channels:
-            await self.queue.put(channel)
+        self._jobs = await self._incremental_jobs() if self.incremental else self._channel_jobs()
+        jobs_by_input = {self._ledger_input(job): job for job in self._jobs}
+        resumed = set()
+        in_flight = await asyncio.to_thread(self.ledger.in_flight_runs, "telegram", self.sweep_id)
+        for run_id, inputs in in_flight.items():
+            job = jobs_by_input.get(inputs[0])
+            if job is None:
+                continue  # Belongs to another request's channels
+            await self.multiplexer.acquire_slot()
+            print(f"Resuming run {run_id} for channel {job[0]}")
+            self.multiplexer.track(run_id, self._finish_run, job)
+            resumed.add(inputs[0])
+
+        completed = await asyncio.to_thread(self.ledger.completed_inputs, "telegram", self.sweep_id, list(jobs_by_input))
+        self._succeeded.update(completed)
+        for ledger_input, job in jobs_by_input.items():
+            if ledger_input in resumed or ledger_input in completed:
+                print(f"Skipping {ledger_input}: range already scraped or resumed")
+                continue
+            await self.queue.put(job)
 
     async def _worker(self):
         """
-        Worker to process each channel, run the scraper, monitor scraping, and save results.
+        Worker to start one run per channel job and hand it to the run multiplexer.
         """
         while True:
-            channel = await self.queue.get()
-            print(f"Worker scraping for channel: {channel}")
-            run_id = await self.scraper.run_scraper()  # Start the scraper run
-            dataset_id = await self.scraper.monitor_scraping(run_id)  # Monitor the run status
-            
-            if dataset_id:
-                results = await self.scraper.fetch_results(dataset_id)
-                filename_prefix = os.path.join(self.save_path, f"{channel}_{dataset_id}")
-                json_filename = f"{filename_prefix}_results.json"
-                csv_filename = f"{filename_prefix}_results.csv"
-                
-                # Save results
-                self.scraper.save_results_json(results, json_filename)
-                self.scraper.save_results_csv(results, csv_filename)
-            
+            job = await self.queue.get()
+            channel, posts_from, posts_to = job
+            try:
+                if not await self.deadline.acquire_slot(self.multiplexer, [self._ledger_input(job)]):
+                    continue  # Past the soft deadline: drain the queue without launching
+                try:
+                    print(f"Worker scraping for channel: {channel} posts {posts_from}-{posts_to}")
+                    run_id = await self.scraper.run_scraper(channel=channel, posts_from=posts_from, posts_to=posts_to)
+                    try:
+                        await asyncio.to_thread(self.ledger.mark_started, "telegram", self.sweep_id,
+                                                [self._ledger_input(job)], run_id)
+                    except Exception as e:
+                        print(f"Could not record run {run_id} as started, {channel} will be scraped again: {e} ⚠️")
+                    finally:
+                        # Also when cancelled here, so the run is still aborted at the deadline and its slot released
+                        self.multiplexer.track(run_id, self._finish_run, job)
+                except QuotaExceededError as e:
+                    await self.multiplexer.release_slot()
+                    self.deadline.drop([self._ledger_input(job)])  # Budget spent: reported like a deadline drop
+                    print(f"Not starting run for channel {channel}: {e} ⚠️")
+                except Exception as e:
+                    await self.multiplexer.release_slot(error=e)
+                    print(f"Failed to start run for channel {channel}: {e} ❌")
+            finally:
+                self.queue.task_done()
+
+    async def _finish_run(self, run_id, job):
+        """
+        Waits for the run to complete and saves its results once.
+        """
+        dataset_id = await self.scraper.monitor_scraping(run_id)  # Wait for the run status
+        ledger_inputs = [self._ledger_input(job)]
+        
+        if not dataset_id:
+            await asyncio.to_thread(self.ledger.mark_finished, "telegram", self.sweep_id, ledger_inputs, FAILED)
+            return False
+
+        item_count = await self._save_dataset(dataset_id, job)
+        await asyncio.to_thread(self.ledger.mark_finished, "telegram", self.sweep_id, ledger_inputs, SUCCEEDED,
+                                dataset_id, {ledger_inputs[0]: item_count})
+        self._succeeded.add(ledger_inputs[0])
+        return True
+
+    async def _save_dataset(self, dataset_id, job):
+        """
+        Streams the dataset to disk page by page and returns the number of items.
+        """
+        filename_prefix = os.path.join(self.save_path, f"{self._channel_name(job[0])}_{dataset_id}")
+        with RawResultsSink(filename_prefix, store=self.raw_store, source="telegram",
+                            partition_key=self._channel_name(job[0])) as sink:
+            return await self.scraper.stream_results(dataset_id, sink)
+
+    async def _abort_run(self, run_id, job):
+        """
+        Aborts a run still going at the hard deadline and saves whatever its dataset already holds.
+        The range stays unscraped in the ledger (ABORTED), so its high-water mark does not move.
+        """
+        ledger_inputs = [self._ledger_input(job)]
+        run_info = await self.scraper.abort_run(run_id)
+        if run_info is None:  # Neither aborted nor found: nothing to save, the range is scraped again
+            await asyncio.to_thread(self.ledger.mark_finished, "telegram", self.sweep_id, ledger_inputs, FAILED)
+            self.deadline.record_abort(run_id, ledger_inputs, "UNKNOWN", 0)
+            return
+        if run_info["status"] == "FAILED":
+            await asyncio.to_thread(self.ledger.mark_finished, "telegram", self.sweep_id, ledger_inputs, FAILED)
+            return
+        dataset_id = run_info["defaultDatasetId"]
+        item_count = await self._save_dataset(dataset_id, job)
+        item_counts = {ledger_inputs[0]: item_count}
+        if run_info["status"] == "SUCCEEDED":  # Finished just before the abort
+            await asyncio.to_thread(self.ledger.mark_finished, "telegram", self.sweep_id,
+                                    ledger_inputs, SUCCEEDED, dataset_id, item_counts)
+            self._succeeded.add(ledger_inputs[0])
+            return
+        await asyncio.to_thread(self.ledger.mark_finished, "telegram", self.sweep_id,
+                                ledger_inputs, ABORTED, dataset_id, item_counts)
+        self.deadline.record_abort(run_id, ledger_inputs, run_info["status"], item_count)
+
+    def _drain_queue(self):
+        """
+        Records jobs still queued at the hard deadline as not launched.
+        """
+        while not self.queue.empty():
+            self.deadline.drop([self._ledger_input(self.queue.get_nowait())])
             self.queue.task_done()
 
+    def _save_deadline_summary(self):
+        if not self.deadline.dropped_anything:
+            return
+        path = self.deadline.save_summary(self.save_path, "telegram")
+        print(f"Deadline summary saved to {path}: {len(self.deadline.not_launched)} ranges not launched, "
+              f"{len(self.deadline.aborted_runs)} runs aborted ⚠️")
+
+    def concurrency_snapshot(self):
+        """
+        Current in-flight run limit and its history, for diagnostics.
+        """
+        return self.multiplexer.controller.snapshot()
+
+    async def _wait_until_done(self):
+        await self.queue.join()
+        await self.multiplexer.join()
+
     async def start_scraping(self):
         """
         Starts the scraping process with the specified number of workers and time limit.
         """
-        await self._load_channels()  # Load channels into the queue
+        self.deadline.start()
+        await self._load_channels()  # Load channel jobs into the queue
         workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
         
         # Monitor the scraping process with a time limit
         try:
-            if self.time_limit:
-                await asyncio.wait_for(self.queue.join(), timeout=self.time_limit * 60)
-            else:
-                await self.queue.join()
+            await asyncio.wait_for(self._wait_until_done(), timeout=self.deadline.timeout)
         except asyncio.TimeoutError:
-            print("Time limit reached, stopping scraping...")
-        
-        for worker in workers:
-            worker.cancel()
+            print("Time limit reached, aborting in-flight runs and saving their partial results...")
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._drain_queue()
+            await self.multiplexer.abort_all(self._abort_run, timeout=self.flush_timeout)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.multiplexer.cancel_all()
+            self._save_deadline_summary()
+            if self.incremental:
+                await asyncio.to_thread(self._advance_marks)
 
 # if __name__ == "__main__":
 #     async def scrap_main():
@@ -43,6 +43,18 @@ class KeywordCombinations:
             print(f"File {file} not found.")
             return []
 
+    @staticmethod
+    def iter_from_text(file):
+        """Yields non-empty combinations one line at a time, without loading the whole file"""
+        try:
+            with open(file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    combination = line.strip()
+                    if combination:
+                        yield combination
+        except FileNotFoundError:
+            print(f"File {file} not found.")
+
     @staticmethod
     def generate_and_save_combinations(csv_file, output_file="search_words.txt"):
         keyword_combinations = KeywordCombinations(csv_file, output_file)
@@ -2,18 +2,37 @@
 # ------------ Import Libraries ----------- #
 #############################################
 from fastapi import FastAPI, BackgroundTasks, HTTPException, Request
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, JSONResponse
+from pydantic import BaseModel, model_validator
 from typing import List
 from time import time
 import logging
 import sys
+import os
+import math
+import hmac
+import uuid
 import asyncio
 from collections import deque
 
 # Other imports remain the same...
-from config import APIFY_API_TOKEN, COOKIES
+from config import APIFY_API_TOKEN, cookies_path, APIFY_WEBHOOK_URL, APIFY_WEBHOOK_SECRET, APIFY_API_URL, \
+    APIFY_MAX_IN_FLIGHT_RUNS, LINKEDIN_BATCH_SIZE, SCRAPE_LEDGER_DB, RAW_STORE_DIR, APIFY_REQUESTS_PER_SECOND, \
+    APIFY_MAX_CONCURRENT_RUNS, APIFY_MONTHLY_COMPUTE_UNITS, APIFY_USAGE_FILE, KEYWORD_EXPLORE_RATIO, \
+    LINKEDIN_MAX_RUNS_PER_SESSION, LINKEDIN_SESSION_FAILURE_LIMIT, LINKEDIN_SESSION_QUARANTINE, LOG_PATH, LOG_JSON_CONSOLE, \
+    PROCESS_INCREMENTAL, PROCESS_CHUNK_ROWS, EXCEL_EXPORT_WORKERS, POST_INDEX_DB, NEAR_DUPLICATE_THRESHOLD, \
+    NEAR_DUPLICATE_DROP
 from scrap_manager import LinkedInScraperManager, TelegramScraperManager
+from crawlers.run_events import run_hub
+from crawlers.scrape_ledger import ScrapeLedger
+from crawlers.raw_store import RawStore
+from crawlers.api_quota import apify_quota
+from crawlers.keyword_scheduler import KeywordScheduler
+from crawlers.cookie_pool import CookiePool
+from crawlers.log_setup import setup_logging, log_context
 from data_processing import LinkedInCSVProcessor, TelegramCSVProcessor
+from excel_export import ExcelExporter
+from near_duplicates import NearDuplicateIndex
 from jobs_ai import JobProcessor
 
 
@@ -22,8 +41,8 @@ from jobs_ai import JobProcessor
 ###############################################
 app = FastAPI()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: queued to a listener thread, JSON lines in LOG_PATH tagged with request/run ids
+setup_logging(level=logging.INFO, log_path=LOG_PATH, json_console=LOG_JSON_CONSOLE)
 logger = logging.getLogger(__name__)
 
 # Request Queue
@@ -36,6 +55,52 @@ is_processing = False
 # Scraping status tracking
 scraping_status = {"status": "Idle"}
 
+# Which inputs were scraped, shared by every manager
+scrape_ledger = ScrapeLedger(SCRAPE_LEDGER_DB)
+
+# Partitioned Parquet raw results, written by the managers and read by the processors
+raw_store = RawStore(RAW_STORE_DIR)
+
+# New emails per compute unit of every LinkedIn keyword/URL, used to scrape the best ones first
+keyword_scheduler = KeywordScheduler(SCRAPE_LEDGER_DB, explore_ratio=KEYWORD_EXPLORE_RATIO)
+
+# LinkedIn accounts leased one per actor run; kept across scrapes so quarantines stick
+cookie_pool = CookiePool.load(
+    cookies_path,
+    max_runs_per_session=LINKEDIN_MAX_RUNS_PER_SESSION,
+    failure_limit=LINKEDIN_SESSION_FAILURE_LIMIT,
+    quarantine_seconds=LINKEDIN_SESSION_QUARANTINE,
+)
+
+# Rate limit, concurrent runs and monthly compute units shared by every Apify call in this process
+apify_quota.configure(
+    requests_per_second=APIFY_REQUESTS_PER_SECOND,
+    max_concurrent_runs=APIFY_MAX_CONCURRENT_RUNS,
+    monthly_compute_units=APIFY_MONTHLY_COMPUTE_UNITS,
+    usage_path=APIFY_USAGE_FILE,
+)
+
+# SimHash index of every processed post, so reposts are tagged across runs and sources before GPT extraction
+near_duplicates = NearDuplicateIndex(POST_INDEX_DB, threshold=NEAR_DUPLICATE_THRESHOLD)
+
+# Excel copies of the output CSVs, built in the background when downloaded and cached until the CSV changes
+excel_exporter = ExcelExporter(workers=EXCEL_EXPORT_WORKERS)
+EXPORT_DIRS = {
+    "linkedin": "Processed_Data/linkedin_processed_data",
+    "telegram": "Processed_Data/telegram_processed_data",
+    "emails": "Processed_Data/emails_database",
+}
+
+# Manager of the scrape currently running (for diagnostics)
+active_manager = None
+
+# URL handed to Apify for run-completion webhooks; none without a secret, since the route would accept anyone
+webhook_url = None
+if APIFY_WEBHOOK_URL and APIFY_WEBHOOK_SECRET:
+    webhook_url = f"{APIFY_WEBHOOK_URL}?token={APIFY_WEBHOOK_SECRET}"
+elif APIFY_WEBHOOK_URL:
+    logger.warning("APIFY_WEBHOOK_URL is set without APIFY_WEBHOOK_SECRET: webhooks disabled, polling only")
+
 # ######################################
 # # --------- API Limitaions --------- #
 # ######################################
@@ -98,8 +163,59 @@ class ScrapeRequest(BaseModel):
     process: bool
     linkedin_signal: bool
     t_channel: List[str] | None | List[None]
-    t_posts_from: List[int]  
-    t_posts_to: List[int]
+    t_posts_from: List[int] | int  # One value per channel, or one range for all of them
+    t_posts_to: List[int] | int
+    t_incremental: bool = False  # Scrape from each channel's high-water mark to its latest post
+    raw_since: str | None = None  # Process only raw store partitions scraped on/after this date (YYYY-MM-DD)
+    request_id: str | None = None  # Set when queued; tags the request's log records
+
+    @model_validator(mode="after")
+    def check_posts_per_channel(self):
+        """Per-channel ranges must cover every channel (answered with 422), or channels would be skipped"""
+        if self.linkedin_signal or not self.t_channel:
+            return self
+        for field in ("t_posts_from", "t_posts_to"):
+            values = getattr(self, field)
+            if isinstance(values, list) and len(values) != len(self.t_channel):
+                raise ValueError(f"{field} has {len(values)} values for {len(self.t_channel)} channels")
+        return self
+
+##################################################
+# ------------ Telegram latest posts ----------- #
+##################################################
+async def fetch_latest_posts(channels: List[str]) -> dict:
+    """
+    Latest post id of each channel over one Telegram connection; None for a channel whose
+    lookup failed. Raises when the session can't connect or isn't authorized.
+    """
+    # Imported here: telethon is only needed by incremental Telegram scrapes
+    from telegram_check import client as telegram_client, get_latest_post_number
+
+    await telegram_client.connect()  # Not `async with`: it would prompt for a login on the server's console
+    try:
+        if not await telegram_client.is_user_authorized():
+            raise RuntimeError("Telegram session is not authorized; log in once from the client (Check Last Posts)")
+        latest_posts = {}
+        for channel in channels:
+            try:
+                latest_posts[channel] = await get_latest_post_number(channel)
+            except Exception as e:
+                logger.error(f"Latest post of {channel} unknown: {e}")
+                latest_posts[channel] = None
+        return latest_posts
+    finally:
+        await telegram_client.disconnect()
+
+def estimate_runs(scrape_request: ScrapeRequest) -> int:
+    """Rough number of actor runs a request will start, to check it against the compute-unit budget"""
+    if not scrape_request.linkedin_signal:
+        return len([channel for channel in scrape_request.t_channel or [] if channel])
+    inputs_path = scrape_request.li_keywords_path if scrape_request.li_search_with_keywords else scrape_request.li_urls_path
+    if not os.path.exists(inputs_path):
+        return 0
+    with open(inputs_path, 'r', encoding='utf-8') as f:
+        inputs = sum(1 for line in f if line.strip())
+    return math.ceil(inputs / LINKEDIN_BATCH_SIZE)
 
 ################################################
 # ------------ Scraping Async task ----------- #
@@ -108,9 +224,13 @@ async def process_queue():
     global is_processing
 
     while True:
-        if request_queue and not is_processing:
+        if request_queue and not is_processing and apify_quota.budget_exhausted():
+            # Deferred, not dropped: the budget resets with the month
+            logger.warning("Apify compute-unit budget spent, deferring queued requests...")
+        elif request_queue and not is_processing:
             scrape_request = request_queue.popleft()
-            await start_scraping_task(scrape_request)
+            with log_context(request_id=scrape_request.request_id):
+                await start_scraping_task(scrape_request)
             print("do start scrapping task")
         else:
             logger.info("Queue is empty, waiting for requests...")
@@ -118,7 +238,7 @@ async def process_queue():
         await asyncio.sleep(60)  # Wait for 5 minutes
 
 async def start_scraping_task(scrape_request: ScrapeRequest):
-    global is_processing
+    global is_processing, active_manager
     is_processing = True
     scraping_status["status"] = "Scraping In Progress .."
     print("start scrap taaaask")
@@ -127,7 +247,7 @@ async def start_scraping_task(scrape_request: ScrapeRequest):
         if scrape_request.linkedin_signal:
             manager = LinkedInScraperManager(
                 api_token=APIFY_API_TOKEN,
-                cookies=COOKIES,
+                cookies=None,
                 keywords_path=scrape_request.li_keywords_path,
                 urls_path=scrape_request.li_urls_path,
                 save_path=scrape_request.li_raw_dir,
@@ -135,7 +255,15 @@ async def start_scraping_task(scrape_request: ScrapeRequest):
                 date=scrape_request.li_date,
                 search_with_keywords=scrape_request.li_search_with_keywords,
                 generate_combinations=scrape_request.li_generate_combinations,
-                time_limit=scrape_request.time_limit
+                time_limit=scrape_request.time_limit,
+                webhook_url=webhook_url,
+                api_url=APIFY_API_URL,
+                max_in_flight_runs=APIFY_MAX_IN_FLIGHT_RUNS,
+                batch_size=LINKEDIN_BATCH_SIZE,
+                ledger=scrape_ledger,
+                raw_store=raw_store,
+                scheduler=keyword_scheduler,
+                cookie_pool=cookie_pool
             )
         else:
             print("start scrap taaaask telegram")
@@ -146,9 +274,17 @@ async def start_scraping_task(scrape_request: ScrapeRequest):
                 save_path=scrape_request.t_raw_dir,
                 posts_from=scrape_request.t_posts_from,
                 posts_to=scrape_request.t_posts_to,
-                time_limit=scrape_request.time_limit
+                time_limit=scrape_request.time_limit,
+                webhook_url=webhook_url,
+                api_url=APIFY_API_URL,
+                max_in_flight_runs=APIFY_MAX_IN_FLIGHT_RUNS,
+                ledger=scrape_ledger,
+                incremental=scrape_request.t_incremental,
+                latest_post_fetcher=fetch_latest_posts,
+                raw_store=raw_store
             )
 
+        active_manager = manager
         await manager.start_scraping()
         scraping_status["status"] = "Completed"
         
@@ -157,7 +293,8 @@ async def start_scraping_task(scrape_request: ScrapeRequest):
             raw_dir = scrape_request.li_raw_dir if scrape_request.linkedin_signal else scrape_request.t_raw_dir
             proc_dir = scrape_request.li_proc_dir if scrape_request.linkedin_signal else scrape_request.t_proc_dir
             processor_class = LinkedInCSVProcessor if scrape_request.linkedin_signal else TelegramCSVProcessor
-            process_data(raw_dir, proc_dir, scrape_request.filtered_file_name, scrape_request.linkedin_signal, processor_class)
+            process_data(raw_dir, proc_dir, scrape_request.filtered_file_name, scrape_request.linkedin_signal, processor_class,
+                         scrape_request.raw_since)
             scraping_status["status"] += " - Processing Complete"
             csv_path = f"Processed_Data/{'linkedin' if scrape_request.linkedin_signal else 'telegram'}_processed_data"
             await gpt_extract(csv_path)
@@ -173,12 +310,17 @@ async def start_scraping_task(scrape_request: ScrapeRequest):
 # ------------ Async Process ----------- #
 ##########################################
 async def start_process_task(scrape_request: ScrapeRequest):
+    with log_context(request_id=scrape_request.request_id or uuid.uuid4().hex[:12]):
+        _run_process_task(scrape_request)
+
+def _run_process_task(scrape_request: ScrapeRequest):
     scraping_status["status"] = "Processing In Progress .."
     raw_dir = scrape_request.li_raw_dir if scrape_request.linkedin_signal else scrape_request.t_raw_dir
     proc_dir = scrape_request.li_proc_dir if scrape_request.linkedin_signal else scrape_request.t_proc_dir
     processor_class = LinkedInCSVProcessor if scrape_request.linkedin_signal else TelegramCSVProcessor
     try:
-        process_data(raw_dir, proc_dir, scrape_request.filtered_file_name, scrape_request.linkedin_signal, processor_class)
+        process_data(raw_dir, proc_dir, scrape_request.filtered_file_name, scrape_request.linkedin_signal, processor_class,
+                     scrape_request.raw_since)
         scraping_status["status"] += " - Processing Complete"
     except Exception as e:
         scraping_status["status"] = f"Failed: {e}"
@@ -187,14 +329,17 @@ async def start_process_task(scrape_request: ScrapeRequest):
 ###########################################
 # ------------ Data processor ----------- #
 ###########################################
-def process_data(raw_dir: str, proc_dir: str, filtered_file_name: str, linkedin_signal: bool, processor_class):
+def process_data(raw_dir: str, proc_dir: str, filtered_file_name: str, linkedin_signal: bool, processor_class,
+                 since: str | None = None):
     try:
-        processor = processor_class(raw_dir, proc_dir)        
+        processor = processor_class(raw_dir, proc_dir, raw_store=raw_store, since=since,
+                                    columns=processor_class.raw_columns, incremental=PROCESS_INCREMENTAL,
+                                    chunk_rows=PROCESS_CHUNK_ROWS, near_duplicates=near_duplicates,
+                                    drop_near_duplicates=NEAR_DUPLICATE_DROP)
         processor.process(
             'postedAtTimestamp' if linkedin_signal else 'date',
             'postTime',
-            f"{filtered_file_name}.csv",  
-            f"{filtered_file_name}.xlsx"  
+            f"{filtered_file_name}.csv"
         )
     except Exception as e:
         logger.error(f"Data processing failed: {e}")
@@ -203,6 +348,10 @@ def process_data(raw_dir: str, proc_dir: str, filtered_file_name: str, linkedin_
 # ------------ GPT Extraction ----------- #
 ###########################################
 async def gpt_extract(csv_path: str, scrape_request: ScrapeRequest):
+    with log_context(request_id=scrape_request.request_id or uuid.uuid4().hex[:12]):
+        await _run_gpt_extract(csv_path, scrape_request)
+
+async def _run_gpt_extract(csv_path: str, scrape_request: ScrapeRequest):
     scraping_status["status"] = "Start GPT Extraction .."
     try:
         processor = JobProcessor(csv_path=csv_path, duration_limit=scrape_request.time_limit)
@@ -224,9 +373,14 @@ async def startup_event():
 
 @app.post("/start_scraping")
 async def start_scraping(scrape_request: ScrapeRequest):
+    if apify_quota.would_exceed(estimate_runs(scrape_request)):
+        raise HTTPException(status_code=429, detail=f"Request would exceed the Apify compute-unit budget: {apify_quota.usage()}")
     if len(request_queue) < MAX_QUEUE_LENGTH:
+        scrape_request.request_id = scrape_request.request_id or uuid.uuid4().hex[:12]
         request_queue.append(scrape_request)
-        return {"message": "Scraping request added to the queue."}
+        logger.info("Scraping request queued", extra={"request_id": scrape_request.request_id,
+                                                      "queue_length": len(request_queue)})
+        return {"message": "Scraping request added to the queue.", "request_id": scrape_request.request_id}
     else:
         raise HTTPException(status_code=429, detail="Queue is full. Please try again later.")
 
@@ -242,6 +396,74 @@ async def start_extract(scrape_request: ScrapeRequest, background_tasks: Backgro
     background_tasks.add_task(gpt_extract, csv_path, scrape_request)
     return {"message": "GPT extraction started"}
 
+@app.post("/apify/webhook")
+async def apify_webhook(request: Request, token: str | None = None):
+    """Receives Apify run webhooks and wakes up the manager waiting on that run"""
+    if not APIFY_WEBHOOK_SECRET:
+        raise HTTPException(status_code=403, detail="Webhooks are disabled: no APIFY_WEBHOOK_SECRET configured.")
+    if not hmac.compare_digest(token or "", APIFY_WEBHOOK_SECRET):
+        raise HTTPException(status_code=403, detail="Invalid webhook token.")
+
+    payload = await request.json()
+    run_info = payload.get("resource") or {}
+    run_id = run_info.get("id") or payload.get("eventData", {}).get("actorRunId")
+    if not run_id:
+        raise HTTPException(status_code=400, detail="Webhook payload has no run id.")
+
+    delivered = run_hub.notify(run_id, run_info)
+    logger.info(f"Webhook {payload.get('eventType')} for run {run_id} (delivered: {delivered})")
+    return {"message": "Webhook received.", "delivered": delivered}
+
 @app.get("/scraping_status")
 def get_scraping_status():
     return {"status": scraping_status["status"]}
+
+@app.get("/apify/usage")
+def get_apify_usage():
+    """Compute units used this month against the budget, runs in flight and API rate limiting"""
+    return apify_quota.usage()
+
+@app.get("/keywords/yield")
+def get_keyword_yield(limit: int = 50):
+    """Best LinkedIn keywords/URLs by expected new emails per compute unit"""
+    return keyword_scheduler.report(limit)
+
+@app.get("/linkedin/sessions")
+def get_linkedin_sessions():
+    """Runs, failures and quarantine of every LinkedIn session in the cookie pool"""
+    return cookie_pool.snapshot()
+
+@app.get("/near_duplicates")
+def get_near_duplicates():
+    """Posts indexed and near-duplicates found per source, with the similarity threshold"""
+    return near_duplicates.summary()
+
+@app.get("/export/excel/{dataset}")
+def export_excel(dataset: str, file: str | None = None):
+    """
+    Excel copy of an output CSV of `dataset` (linkedin, telegram or emails): `file`, or the
+    most recent one. Returns the workbook when it is ready, else starts building it in the
+    background and answers 202; poll again to download it.
+    """
+    directory = EXPORT_DIRS.get(dataset)
+    if directory is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset {dataset}, expected one of {list(EXPORT_DIRS)}.")
+    csv_files = [f for f in os.listdir(directory) if f.endswith(".csv")] if os.path.isdir(directory) else []
+    if file is None and csv_files:
+        file = max(csv_files, key=lambda f: os.path.getmtime(os.path.join(directory, f)))
+    if file not in csv_files:
+        raise HTTPException(status_code=404, detail=f"No CSV file {file or ''} in {directory}.")
+
+    status = excel_exporter.request(os.path.join(directory, file))
+    if status["status"] == "ready":
+        return FileResponse(status["path"], filename=os.path.basename(status["path"]))
+    if status["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Excel export failed: {status['error']}")
+    return JSONResponse(status_code=202, content={"status": "building", "file": os.path.basename(status["path"])})
+
+@app.get("/concurrency")
+def get_concurrency():
+    """Current in-flight actor run limit of the running (or last) scrape and how it changed"""
+    if active_manager is None:
+        return {"status": "Idle"}
+    return active_manager.concurrency_snapshot()
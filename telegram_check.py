@@ -8,20 +8,16 @@ api_hash = 'c0b4ac7c0dba17132c7b77ad08991dc4'  # استبدل YOUR_API_HASH بم
 client = TelegramClient('session_name', api_id, api_hash)
 
 async def get_latest_post_number(channel_username):
-    try:
-        # الحصول على آخر رسالة في القناة
-        message = await client.get_messages(channel_username, limit=1)
-        if message:
-            # رقم المنشور الأخير
-            post_number = message[0].id
-            print(f"تسلسل آخر بوست هو: {post_number}")
-        else:
-            print("لا توجد منشورات في القناة.")
-
-        return post_number 
-    
-    except:
+    """Id of the channel's latest post, 0 when it has none; Telegram errors are raised, not read as 0"""
+    # الحصول على آخر رسالة في القناة
+    message = await client.get_messages(channel_username, limit=1)
+    if not message:
+        print("لا توجد منشورات في القناة.")
         return 0
+    # رقم المنشور الأخير
+    post_number = message[0].id
+    print(f"تسلسل آخر بوست هو: {post_number}")
+    return post_number
     
 # with client:
 #     # ضع اسم المستخدم الخاص بالقناة هنا
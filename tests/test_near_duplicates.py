@@ -0,0 +1,56 @@
+import pandas as pd
+
+from data_processing import TelegramCSVProcessor
+from near_duplicates import NearDuplicateIndex
+
+POST = ("Hiring a senior accountant for our Riyadh office, five years of experience in audit "
+        "and IFRS reporting required, send your CV to jobs@example.com before the end of the month")
+
+
+def write_raw(raw_dir, name, channel, date, text):
+    pd.DataFrame({
+        "authorName": [channel], "channelName": [channel], "date": [date], "id": [1], "text": [text],
+        "scrappingDate": ["2024-11-06 00:54:00"],
+    }).to_csv(raw_dir / f"{name}_results.csv", index=False)
+
+
+def process(raw_dir, proc_dir, db_path, output_name):
+    # A new index per run, as after a server restart: only what is in the database carries over
+    index = NearDuplicateIndex(str(db_path))
+    TelegramCSVProcessor(str(raw_dir), str(proc_dir), incremental=True, near_duplicates=index).process(
+        'date', 'postTime', output_name)
+    return pd.read_csv(proc_dir / output_name)
+
+
+def test_new_output_name_keeps_earlier_posts_indexed(tmp_path):
+    raw_dir, proc_dir, db_path = tmp_path / "raw", tmp_path / "proc", tmp_path / "post_index.db"
+    raw_dir.mkdir()
+
+    write_raw(raw_dir, "first", "jobs_a", "2024-11-01T10:00:00+00:00", POST)
+    first = process(raw_dir, proc_dir, db_path, "20241101_100000_first.csv")
+    assert first["duplicateOf"].tolist() == ["-"]
+
+    # Reposted in another channel, and processed into a new output as the client names them
+    write_raw(raw_dir, "second", "jobs_b", "2024-11-02T10:00:00+00:00", "  " + POST.upper() + " #jobs")
+    second = process(raw_dir, proc_dir, db_path, "20241102_100000_second.csv")
+    assert second["channelName"].tolist() == ["jobs_b"]
+    assert second["duplicateOf"].tolist() == ["telegram:jobs_a/2024-11-01T10:00:00+00:00"]
+
+    # Deleting an output re-seeds the ingest manifest, but leaves the index alone
+    (proc_dir / "20241101_100000_first.csv").unlink()
+    write_raw(raw_dir, "third", "jobs_c", "2024-11-03T10:00:00+00:00", POST + " https://example.com/apply")
+    third = process(raw_dir, proc_dir, db_path, "20241103_100000_third.csv")
+    assert third.set_index("channelName")["duplicateOf"].to_dict() == {
+        "jobs_a": "-", "jobs_c": "telegram:jobs_a/2024-11-01T10:00:00+00:00"}
+
+
+def test_full_rebuild_resets_the_source(tmp_path):
+    raw_dir, proc_dir, db_path = tmp_path / "raw", tmp_path / "proc", tmp_path / "post_index.db"
+    raw_dir.mkdir()
+    write_raw(raw_dir, "first", "jobs_a", "2024-11-01T10:00:00+00:00", POST)
+    process(raw_dir, proc_dir, db_path, "first.csv")
+
+    index = NearDuplicateIndex(str(db_path))
+    TelegramCSVProcessor(str(raw_dir), str(proc_dir), near_duplicates=index).process('date', 'postTime', 'full.csv')
+    assert pd.read_csv(proc_dir / "full.csv")["duplicateOf"].tolist() == ["-"]
+    assert index.summary()["sources"]["telegram"] == {"posts": 1, "near_duplicates": 0}
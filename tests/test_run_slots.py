@@ -0,0 +1,71 @@
+import asyncio
+
+from crawlers.api_quota import ApifyQuota
+from crawlers.run_multiplexer import RunMultiplexer
+
+
+async def start_runs(quota, multiplexer, run_ids, handler):
+    """Takes a quota slot per run, as the backend does when it starts one, and hands the run to the multiplexer"""
+    for run_id in run_ids:
+        await quota.acquire_run()
+        quota.run_started(run_id)
+        await multiplexer.acquire_slot()
+        multiplexer.track(run_id, handler)
+
+
+async def wait_forever(run_id):
+    await asyncio.Event().wait()
+
+
+def test_flush_timeout_releases_every_slot():
+    async def main():
+        quota = ApifyQuota(usage_path=None)
+        multiplexer = RunMultiplexer(max_in_flight=3, release_run=quota.release_run)
+        await start_runs(quota, multiplexer, ["a", "b", "c"], wait_forever)
+        assert quota.active_runs == {"a", "b", "c"}
+
+        # The abort handlers never get to run_finished: the flush times out and cancels them
+        aborted = await multiplexer.abort_all(wait_forever, timeout=0.05)
+        assert sorted(aborted) == ["a", "b", "c"]
+        assert quota.active_runs == set()
+
+    asyncio.run(main())
+
+
+def test_failed_abort_and_cancel_release_their_slots():
+    async def main():
+        quota = ApifyQuota(usage_path=None)
+        multiplexer = RunMultiplexer(max_in_flight=4, release_run=quota.release_run)
+
+        async def abort_fails(run_id):
+            raise RuntimeError("abort and get_run both failed")
+
+        await start_runs(quota, multiplexer, ["a", "b"], wait_forever)
+        await multiplexer.abort_all(abort_fails, timeout=1)
+        assert quota.active_runs == set()
+
+        # A worker raising makes start_scraping cancel the runs without aborting them
+        await start_runs(quota, multiplexer, ["c", "d"], wait_forever)
+        tasks = list(multiplexer._in_flight.values())
+        multiplexer.cancel_all()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert quota.active_runs == set()
+        assert quota.runs_in_use == 0
+
+    asyncio.run(main())
+
+
+def test_release_is_idempotent():
+    async def main():
+        quota = ApifyQuota(usage_path=None, max_concurrent_runs=1)
+        await quota.acquire_run()
+        quota.run_started("a")
+        await quota.run_finished("a", {"stats": {"computeUnits": 0.5}})
+        await quota.release_run("a")
+        assert quota.runs_in_use == 0
+        assert quota.usage()["runs_finished"] == 1
+
+        # The slot is free again: this would hang if a release had been lost
+        await asyncio.wait_for(quota.acquire_run(), timeout=1)
+
+    asyncio.run(main())
@@ -1,22 +1,13 @@
-import os
 import pandas as pd
 import ast
+# csv_ingest and schemas sit next to this package at the repo root, which is already on sys.path for it to import
+from csv_ingest import load_and_concat_csvs as _load_csvs
+from schemas import EMAILS_DATABASE_SCHEMA
 
-def load_and_concat_csvs(directory_path):
-    # Get a list of all CSV files in the specified directory
-    csv_files = [f for f in os.listdir(directory_path) if f.endswith('.csv')]
-    
-    # If no CSV files are found, return an empty DataFrame
-    if not csv_files:
-        return pd.DataFrame()
 
-    # Read each CSV file and store DataFrames in a list
-    dataframes = [pd.read_csv(os.path.join(directory_path, f)) for f in csv_files]
-    
-    # Concatenate all DataFrames along the rows (axis=0)
-    concatenated_df = pd.concat(dataframes, axis=0, ignore_index=True)
-    
-    return concatenated_df
+def load_and_concat_csvs(directory_path: str) -> pd.DataFrame:
+    """The emails database CSVs in `directory_path` as one DataFrame, typed by its declared schema"""
+    return _load_csvs(directory_path, schema=EMAILS_DATABASE_SCHEMA)
 
 
 # Group by 'email' and aggregate to get unique values for 'city', 'region', and 'sectors'